@@ -1,41 +1,75 @@
 from flask import Flask
 
+from . import apidocs, compression, engine, metrics, query_guard, routing
 from .api.health import bp as health_bp
+from .api.io import bp as io_bp
+from .api.jobs import bp as jobs_bp
+from .api.metrics import bp as metrics_bp
 from .api.orders import bp as orders_bp
 from .api.users import bp as users_bp
-from .api.io import bp as io_bp
 from .cli import register_cli
 from .config import load_config
 from .errors import register_error_handlers
 from .extensions import cors, db, migrate
-
-from flasgger import Swagger
+from .json_provider import JSONProvider
+from .services import order_stats, versions
 
 
 def create_app():
     app = Flask(__name__)
     load_config(app)
+    # acepta fragmentos JSON ya codificados (listados y exports)
+    app.json = JSONProvider(app)
+
+    # Métricas de requests y SQL (antes de crear los engines: instrumenta el pool)
+    metrics.init_app(app)
+
+    # N+1 y consultas lentas (opt-in, activo en desarrollo)
+    query_guard.init_app(app)
 
     # Extensiones
     db.init_app(app)
+    # PRAGMAs de SQLite y log de la configuración del pool
+    engine.init_app(app)
+    # GETs de lectura a la réplica (si DATABASE_READ_URL está configurada)
+    routing.init_app(app)
     migrate.init_app(app, db)
-    cors.init_app(app, resources={r"/*": {"origins": app.config.get("CORS_ORIGINS", "*")}})
+    cors.init_app(
+        app,
+        resources={r"/*": {"origins": app.config.get("CORS_ORIGINS", "*")}},
+        expose_headers=[routing.PIN_HEADER],  # read-your-writes desde el frontend
+    )
 
-    # Swagger (UI en /apidocs)
-    app.config["SWAGGER"] = {"title": "Fullstack Challenge API", "uiversion": 3}
-    Swagger(app)
+    # Swagger (UI en /apidocs): dinámico, spec estático generado en el build o apagado
+    apidocs.init_app(app)
 
     # Blueprints
     app.register_blueprint(health_bp)
     app.register_blueprint(orders_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(io_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(metrics_bp)
 
     # Importa modelos para que Flask-Migrate los detecte
-    from .models import order, user  # noqa: F401
+    from .models import (  # noqa: F401
+        idempotency_key,
+        job,
+        order,
+        table_version,
+        user,
+        user_order_stats,
+    )
+
+    # Versiones por tabla para ETag/Last-Modified y resumen de órdenes por usuario
+    versions.init_app(app)
+    order_stats.init_app(app)
 
     # Errores JSON
     register_error_handlers(app)
 
+    # gzip negociado con Accept-Encoding (incluye respuestas en streaming)
+    compression.init_app(app)
+
     register_cli(app)
     return app
@@ -1,35 +1,52 @@
 from flask import Blueprint, jsonify, request
-from decimal import Decimal
-from ..models.user import User
-from ..models.order import Order
-from ..extensions import db
+
+from .. import plans
+from ..apidocs import swag_from
 from ..errors import make_error
-from flasgger import swag_from
+from ..extensions import db
+from ..services import imports, readers, versions
+from ..services.exports import csv_lines, json_body, ndjson_lines, ndjson_sources
 
 bp = Blueprint("io", __name__)
 
-def serialize_user(u: User) -> dict:
-    return {
-        "id": u.id,
-        "name": u.name,
-        "email": u.email,
-        "created_at": u.created_at.isoformat(),
-    }
+# -------- EXPORT --------
+# Formatos (?format= o negociado con Accept):
+# - json (por defecto): la respuesta de siempre, {items: [...]}.
+# - ndjson: streaming, un objeto JSON por línea.
+# - csv: streaming, encabezado + una fila por registro (solo users y orders).
+# ndjson y csv leen la tabla en bloques de EXPORT_CHUNK_SIZE (keyset por id) y
+# escriben a medida que leen, así la memoria del worker no depende del tamaño
+# de la tabla y el primer byte sale enseguida.
 
-def serialize_order(o: Order) -> dict:
-    # asegura serialización de Decimal
-    amount = float(o.amount) if isinstance(o.amount, Decimal) else o.amount
-    return {
-        "id": o.id,
-        "user_id": o.user_id,
-        "product_name": o.product_name,
-        "amount": amount,
-        "created_at": o.created_at.isoformat(),
-    }
+NDJSON_MIMETYPE = "application/x-ndjson"
+CSV_MIMETYPE = "text/csv"
+EXPORT_MIMETYPES = {"json": "application/json", "ndjson": NDJSON_MIMETYPE, "csv": CSV_MIMETYPE}
 
-# -------- EXPORT --------
+def export_format(allowed=("json", "ndjson", "csv")):
+    """Devuelve (formato, error) según ?format= o el header Accept."""
+    fmt = (request.args.get("format") or "").strip().lower()
+    if fmt:
+        if fmt not in allowed:
+            return None, make_error(
+                400, "bad_request", f"format debe ser uno de: {', '.join(allowed)}"
+            )
+        return fmt, None
+    best = request.accept_mimetypes.best_match([EXPORT_MIMETYPES[f] for f in allowed])
+    return next((f for f in allowed if EXPORT_MIMETYPES[f] == best), "json"), None
+
+def stream_body(name: str, fmt: str):
+    if fmt == "csv":
+        yield from csv_lines(name)
+        return
+    for source in ndjson_sources(name):
+        yield from ndjson_lines(*source)
+
+def stream_response(name: str, fmt: str):
+    return plans.stream(stream_body(name, fmt), mimetype=EXPORT_MIMETYPES[fmt])
 
 @bp.get("/export/users")
+@plans.view
+@versions.conditional("users")
 def export_users():
     """Exportar todos los usuarios
     ---
@@ -37,6 +54,13 @@ def export_users():
       - Export
     summary: Exportar todos los usuarios de la base de datos
     description: Retorna una lista de todos los usuarios ordenados por ID de forma ascendente
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [json, ndjson, csv]
+        description: "ndjson: streaming, una línea JSON por registro; csv: streaming, una fila
+          por registro (también vía Accept: application/x-ndjson o text/csv)"
     responses:
       200:
         description: Lista de usuarios exportada exitosamente
@@ -64,10 +88,16 @@ def export_users():
                         format: date-time
                         description: Fecha y hora de creación del usuario
     """
-    users = User.query.order_by(User.id.asc()).all()
-    return jsonify({"items": [serialize_user(u) for u in users]})
+    fmt, err = export_format()
+    if err:
+        return err
+    if fmt != "json":
+        return stream_response("users", fmt)
+    return jsonify((yield from json_body("users")))
 
 @bp.get("/export/orders")
+@plans.view
+@versions.conditional("orders")
 def export_orders():
     """Exportar todas las órdenes
     ---
@@ -75,6 +105,13 @@ def export_orders():
       - Export
     summary: Exportar todas las órdenes de la base de datos
     description: Retorna una lista de todas las órdenes ordenadas por ID de forma ascendente
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [json, ndjson, csv]
+        description: "ndjson: streaming, una línea JSON por registro; csv: streaming, una fila
+          por registro (también vía Accept: application/x-ndjson o text/csv)"
     responses:
       200:
         description: Lista de órdenes exportada exitosamente
@@ -106,17 +143,31 @@ def export_orders():
                         format: date-time
                         description: Fecha y hora de creación de la orden
     """
-    orders = Order.query.order_by(Order.id.asc()).all()
-    return jsonify({"items": [serialize_order(o) for o in orders]})
+    fmt, err = export_format()
+    if err:
+        return err
+    if fmt != "json":
+        return stream_response("orders", fmt)
+    return jsonify((yield from json_body("orders")))
 
 @bp.get("/export/all")
+@plans.view
+@versions.conditional("users", "orders")
 def export_all():
     """Exportar todos los usuarios y órdenes
     ---
     tags:
       - Export
     summary: Exportar todos los usuarios y órdenes de la base de datos
-    description: Retorna tanto usuarios como órdenes en una sola respuesta, útil para exportación completa de datos
+    description: Retorna tanto usuarios como órdenes en una sola respuesta, útil para exportación
+      completa de datos
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [json, ndjson]
+        description: "ndjson: streaming, una línea {type: user|order, data} por registro (también
+          vía Accept: application/x-ndjson)"
     responses:
       200:
         description: Todos los datos exportados exitosamente
@@ -166,24 +217,72 @@ def export_all():
                         format: date-time
                         description: Fecha y hora de creación de la orden
     """
-    users = User.query.order_by(User.id.asc()).all()
-    orders = Order.query.order_by(Order.id.asc()).all()
-    return jsonify({
-        "users": [serialize_user(u) for u in users],
-        "orders": [serialize_order(o) for o in orders],
-    })
+    fmt, err = export_format(("json", "ndjson"))
+    if err:
+        return err
+    if fmt != "json":
+        return stream_response("all", fmt)
+    return jsonify((yield from json_body("all")))
 
 # -------- IMPORT --------
 # Diseño minimalista: espera {"items":[...]}.
 # - /import/users: crea usuarios nuevos; ignora "id"; saltea duplicados por email.
 # - /import/orders: requiere user_id existente; "amount" > 0 (number); ignora "id".
+# Se procesa en bloques de IMPORT_CHUNK_SIZE con commit por bloque (ver
+# services/imports.py); la duración de cada bloque va al log y un resumen
+# en el header Server-Timing.
+# También aceptan bodies NDJSON (application/x-ndjson) y CSV (text/csv),
+# opcionalmente con "Content-Encoding: gzip"; esos se leen de forma incremental
+# desde request.stream (ver services/readers.py).
+
+def request_items():
+    """Devuelve (items, error); items puede ser una lista o un iterador perezoso."""
+    encoding = (request.headers.get("Content-Encoding") or "identity").strip().lower()
+    if encoding not in ("identity", "gzip"):
+        return None, make_error(415, "unsupported_encoding", "Content-Encoding soportados: gzip")
+    if request.mimetype in readers.STREAM_MIMETYPES or encoding == "gzip":
+        items = readers.iter_items(request.stream, request.mimetype, gzipped=encoding == "gzip")
+        return items, None
+
+    data = request.get_json(silent=True) or {}
+    items = data.get("items")
+    if not isinstance(items, list):
+        return None, make_error(400, "invalid_json", "Se esperaba { items: [] }")
+    return items, None
+
+def run_import(importer):
+    items, err = request_items()
+    if err:
+        return err
+    try:
+        result = importer(items)
+    except readers.ReaderError as e:
+        db.session.rollback()
+        # los bloques ya commiteados quedan importados
+        return make_error(400, "invalid_body", str(e))
+    return import_response(result)
+
+def import_response(result: dict):
+    chunks = result["chunks"]
+    resp = jsonify({"created": result["created"], "skipped": result["skipped"]})
+    resp.status_code = 201
+    if chunks:
+        resp.headers["Server-Timing"] = (
+            f"import;dur={sum(chunks):.2f}, "
+            f'chunks;desc="{len(chunks)}", '
+            f"slowest-chunk;dur={max(chunks):.2f}"
+        )
+    return resp
 
 @bp.post("/import/users")
 @swag_from({
   "tags": ["Import"],
   "summary": "Importar usuarios desde datos JSON",
-  "description": "Crea nuevos usuarios desde los datos proporcionados. Omite duplicados basados en email e ignora entradas inválidas.",
-  "consumes": ["application/json"],
+  "description": (
+    "Crea nuevos usuarios desde los datos proporcionados. Omite duplicados basados en email e"
+    " ignora entradas inválidas."
+  ),
+  "consumes": ["application/json", "application/x-ndjson", "text/csv"],
   "parameters": [{
     "in": "body",
     "name": "body",
@@ -242,7 +341,7 @@ def export_all():
       }
     },
     "400": {
-      "description": "Formato JSON inválido",
+      "description": "Body inválido (JSON, NDJSON, CSV o gzip)",
       "schema": {
         "type": "object",
         "properties": {
@@ -260,34 +359,17 @@ def export_all():
   }
 })
 def import_users():
-    data = request.get_json(silent=True) or {}
-    items = data.get("items")
-    if not isinstance(items, list):
-        return make_error(400, "invalid_json", "Se esperaba { items: [] }")
-
-    created, skipped = 0, 0
-    for it in items:
-        name = (it.get("name") or "").strip()
-        email = (it.get("email") or "").strip().lower()
-        if not name or not email:
-            skipped += 1
-            continue
-        # saltear si email existe
-        if User.query.filter_by(email=email).first():
-            skipped += 1
-            continue
-        u = User(name=name, email=email)
-        db.session.add(u)
-        created += 1
-    db.session.commit()
-    return jsonify({"created": created, "skipped": skipped}), 201
+    return run_import(imports.import_users)
 
 @bp.post("/import/orders")
 @swag_from({
   "tags": ["Import"],
   "summary": "Importar órdenes desde datos JSON",
-  "description": "Crea nuevas órdenes desde los datos proporcionados. Requiere user_id existente y monto positivo. Omite entradas inválidas.",
-  "consumes": ["application/json"],
+  "description": (
+    "Crea nuevas órdenes desde los datos proporcionados. Requiere user_id existente y monto"
+    " positivo. Omite entradas inválidas."
+  ),
+  "consumes": ["application/json", "application/x-ndjson", "text/csv"],
   "parameters": [{
     "in": "body",
     "name": "body",
@@ -346,13 +428,15 @@ def import_users():
           },
           "skipped": {
             "type": "integer",
-            "description": "Número de órdenes omitidas (user_id inválido, monto inválido, o datos inválidos)"
+            "description": (
+              "Número de órdenes omitidas (user_id inválido, monto inválido, o datos inválidos)"
+            )
           }
         }
       }
     },
     "400": {
-      "description": "Formato JSON inválido",
+      "description": "Body inválido (JSON, NDJSON, CSV o gzip)",
       "schema": {
         "type": "object",
         "properties": {
@@ -370,33 +454,4 @@ def import_users():
   }
 })
 def import_orders():
-    data = request.get_json(silent=True) or {}
-    items = data.get("items")
-    if not isinstance(items, list):
-        return make_error(400, "invalid_json", "Se esperaba { items: [] }")
-
-    created, skipped = 0, 0
-    for it in items:
-        try:
-            user_id = int(it.get("user_id"))
-            product_name = (it.get("product_name") or "").strip()
-            amount = float(it.get("amount"))
-        except Exception:
-            skipped += 1
-            continue
-
-        if not product_name or amount <= 0:
-            skipped += 1
-            continue
-
-        user = User.query.get(user_id)
-        if not user:
-            skipped += 1
-            continue
-
-        o = Order(user_id=user_id, product_name=product_name, amount=amount)
-        db.session.add(o)
-        created += 1
-
-    db.session.commit()
-    return jsonify({"created": created, "skipped": skipped}), 201
+    return run_import(imports.import_orders)
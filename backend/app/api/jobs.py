@@ -0,0 +1,103 @@
+# app/api/jobs.py
+from flask import Blueprint, jsonify, request, send_file, url_for
+
+from ..apidocs import swag_from
+from ..errors import make_error
+from ..extensions import db
+from ..models import Job
+from ..services import jobs, readers
+
+bp = Blueprint("jobs", __name__)
+
+def accepted(job: Job):
+    resp = jsonify(jobs.serialize_job(job))
+    resp.status_code = 202
+    resp.headers["Location"] = url_for("jobs.get_job", job_id=job.id)
+    return resp
+
+@bp.post("/jobs/import/<any(users, orders):target>")
+@swag_from({
+  "tags": ["Jobs"],
+  "summary": "Importar usuarios u órdenes en segundo plano",
+  "description": (
+    "Mismo body que /import/users|orders (JSON, NDJSON o CSV, opcionalmente gzip). "
+    "Responde 202 con el job; el progreso se consulta en GET /jobs/{id}."
+  ),
+  "consumes": ["application/json", "application/x-ndjson", "text/csv"],
+  "parameters": [
+    {"in": "path", "name": "target", "type": "string", "enum": ["users", "orders"],
+     "required": True},
+    {"in": "body", "name": "body", "required": True, "schema": {"type": "object"}}
+  ],
+  "responses": {
+    "202": {"description": "Job encolado"},
+    "415": {"description": "Content-Encoding no soportado"}
+  }
+})
+def create_import_job(target: str):
+    encoding = (request.headers.get("Content-Encoding") or "identity").strip().lower()
+    if encoding not in ("identity", "gzip"):
+        return make_error(415, "unsupported_encoding", "Content-Encoding soportados: gzip")
+    mimetype = request.mimetype
+    if mimetype not in readers.STREAM_MIMETYPES:
+        mimetype = "application/json"
+    job = jobs.create_import(target, request.stream, mimetype, gzipped=encoding == "gzip")
+    return accepted(job)
+
+@bp.post("/jobs/export/<any(users, orders, all):target>")
+@swag_from({
+  "tags": ["Jobs"],
+  "summary": "Exportar en segundo plano",
+  "description": (
+    "Genera el export en un archivo; se descarga en GET /jobs/{id}/result cuando el job termina."
+  ),
+  "parameters": [
+    {"in": "path", "name": "target", "type": "string", "enum": ["users", "orders", "all"],
+     "required": True},
+    {"in": "query", "name": "format", "type": "string", "enum": ["json", "ndjson"],
+     "default": "json"}
+  ],
+  "responses": {"202": {"description": "Job encolado"}, "400": {"description": "Formato inválido"}}
+})
+def create_export_job(target: str):
+    fmt = (request.args.get("format") or "json").strip().lower()
+    if fmt not in jobs.EXPORT_MIMETYPES:
+        return make_error(400, "bad_request", "format debe ser json o ndjson")
+    return accepted(jobs.create_export(target, fmt))
+
+@bp.get("/jobs/<job_id>")
+@swag_from({
+  "tags": ["Jobs"],
+  "summary": "Estado y progreso de un job",
+  "parameters": [{"in": "path", "name": "job_id", "type": "string", "required": True}],
+  "responses": {"200": {"description": "OK"}, "404": {"description": "Job no encontrado"}}
+})
+def get_job(job_id: str):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return make_error(404, "job_not_found", "Job no encontrado")
+    return jsonify(jobs.serialize_job(job)), 200
+
+@bp.get("/jobs/<job_id>/result")
+@swag_from({
+  "tags": ["Jobs"],
+  "summary": "Resultado de un job terminado",
+  "description": "Import: {created, skipped}. Export: el archivo generado (JSON o NDJSON).",
+  "parameters": [{"in": "path", "name": "job_id", "type": "string", "required": True}],
+  "responses": {
+    "200": {"description": "OK"},
+    "404": {"description": "Job no encontrado"},
+    "409": {"description": "El job todavía no terminó o falló"}
+  }
+})
+def get_job_result(job_id: str):
+    job = db.session.get(Job, job_id)
+    if not job:
+        return make_error(404, "job_not_found", "Job no encontrado")
+    if job.status != "succeeded":
+        return make_error(409, "job_not_ready", f"El job está en estado {job.status}",
+                          details={"error": job.error} if job.error else None)
+    if job.kind.startswith("import_"):
+        return jsonify(job.result), 200
+    return send_file(job.result["path"], mimetype=job.result["mimetype"], as_attachment=True,
+                     download_name=f"{job.kind}-{job.id}.{job.params['format']}")
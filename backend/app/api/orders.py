@@ -1,26 +1,71 @@
 # app/api/orders.py
-from flask import Blueprint, request, jsonify
-from sqlalchemy.orm import selectinload
+import math
+from datetime import datetime, timedelta, timezone
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import exists, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+
+from .. import plans
+from ..apidocs import swag_from
+from ..errors import FOREIGN_KEY_VIOLATION, make_error, violated
 from ..extensions import db
 from ..models import Order, User
-from ..errors import make_error
-from flasgger import swag_from
+from ..services import idempotency, order_stats, rows, search, versions
+from ..services.imports import existing_user_ids
+from .pagination import (
+    cursor_page,
+    key_value,
+    offset_page,
+    page_body,
+    parse_count_mode,
+    parse_cursor,
+    parse_pagination,
+    parse_sort,
+    seek,
+    sort_key,
+)
 
 bp = Blueprint("orders", __name__)
 
-def parse_pagination():
-    from flask import request
-    try:
-        page = int(request.args.get("page", 1))
-        limit = int(request.args.get("limit", 10))
-    except ValueError:
-        from ..errors import make_error
-        return None, None, make_error(400, "bad_request", "page y limit deben ser enteros")
-    page = max(1, page)
-    limit = min(max(1, limit), 100)
-    return page, limit, None
+IDEMPOTENCY_PARAM = {
+  "in": "header", "name": "Idempotency-Key", "type": "string", "required": False,
+  "description": "Reintentos seguros: la misma clave con el mismo body devuelve la respuesta"
+                 " original sin volver a crear"
+}
+ORDER_SCHEMA = {
+  "type": "object",
+  "required": ["user_id", "product_name", "amount"],
+  "properties": {
+    "user_id": {"type": "integer"},
+    "product_name": {"type": "string"},
+    "amount": {"type": "number", "minimum": 0.01}
+  }
+}
+
+def validate_order(data):
+    """Devuelve (fila, None) o (None, mensaje de validación)."""
+    if not isinstance(data, dict):
+        return None, "Se esperaba un objeto"
+    user_id = data.get("user_id")
+    product_name = (data.get("product_name") or "").strip()
+    amount = data.get("amount")
+
+    if not isinstance(user_id, int) or not product_name or not isinstance(amount, (int, float)):
+        return None, "user_id (int), product_name y amount (number) son obligatorios"
+    if amount <= 0:
+        return None, "amount debe ser > 0"
+    return {"user_id": user_id, "product_name": product_name, "amount": amount}, None
+
+def insert_if_user_exists(row: dict):
+    columns = list(row)
+    values = select(*(literal(row[c], Order.__table__.c[c].type) for c in columns)).where(
+        exists().where(User.id == row["user_id"])
+    )
+    return insert(Order).from_select(columns, values).returning(*rows.ORDER_COLUMNS)
 
 @bp.post("/orders")
+@idempotency.idempotent
 @swag_from({
   "tags": ["Orders"],
   "summary": "Crear pedido",
@@ -29,16 +74,8 @@ def parse_pagination():
     "in": "body",
     "name": "body",
     "required": True,
-    "schema": {
-      "type": "object",
-      "required": ["user_id", "product_name", "amount"],
-      "properties": {
-        "user_id": {"type": "integer"},
-        "product_name": {"type": "string"},
-        "amount": {"type": "number", "minimum": 0.01}
-      }
-    }
-  }],
+    "schema": ORDER_SCHEMA
+  }, IDEMPOTENCY_PARAM],
   "responses": {"201": {"description": "Creado"}, "422": {"description": "Validación fallida"}}
 })
 def create_order():
@@ -46,21 +83,23 @@ def create_order():
     if not data:
         return make_error(400, "invalid_json", "Se esperaba JSON")
 
-    user_id = data.get("user_id")
-    product_name = (data.get("product_name") or "").strip()
-    amount = data.get("amount")
+    row, message = validate_order(data)
+    if message:
+        return make_error(422, "validation_error", message)
 
-    if not isinstance(user_id, int) or not product_name or not isinstance(amount, (int, float)):
-        return make_error(422, "validation_error", "user_id (int), product_name y amount (number) son obligatorios")
-    if amount <= 0:
-        return make_error(422, "validation_error", "amount debe ser > 0")
-
-    user = User.query.get(user_id)
-    if not user:
+    # una sola sentencia: INSERT ... SELECT ... WHERE EXISTS (usuario) no inserta
+    # nada si el user_id no existe (aun con SQLITE_FOREIGN_KEYS=0) y RETURNING
+    # trae id y created_at. La FK cubre un usuario borrado en paralelo.
+    try:
+        order = db.session.execute(insert_if_user_exists(row)).one_or_none()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not violated(e, FOREIGN_KEY_VIOLATION):
+            raise
+        order = None
+    if order is None:
         return make_error(422, "validation_error", "user_id no existe")
-
-    order = Order(user_id=user_id, product_name=product_name, amount=amount)
-    db.session.add(order)
+    order_stats.add_orders(db.session.connection(), [order._mapping])
     db.session.commit()
 
     return jsonify({
@@ -71,48 +110,203 @@ def create_order():
         "created_at": order.created_at.isoformat()
     }), 201
 
+@bp.post("/orders/batch")
+@idempotency.idempotent
+@swag_from({
+  "tags": ["Orders"],
+  "summary": "Crear varios pedidos en una transacción (todo o nada)",
+  "consumes": ["application/json"],
+  "parameters": [{
+    "in": "body",
+    "name": "body",
+    "required": True,
+    "schema": {
+      "type": "object",
+      "required": ["orders"],
+      "properties": {
+        "orders": {"type": "array", "items": ORDER_SCHEMA,
+                   "description": "Hasta ORDERS_BATCH_MAX (500)"}
+      }
+    }
+  }, IDEMPOTENCY_PARAM],
+  "responses": {
+    "201": {"description": "Creados, en el orden recibido"},
+    "422": {"description": "Validación fallida (details: índice y motivo de cada orden rechazada)"}
+  }
+})
+def create_orders_batch():
+    data = request.get_json(silent=True)
+    items = data.get("orders") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return make_error(
+            400, "invalid_json", "Se esperaba {\"orders\": [...]} con al menos una orden"
+        )
+    max_items = current_app.config["ORDERS_BATCH_MAX"]
+    if len(items) > max_items:
+        return make_error(422, "validation_error", f"Máximo {max_items} órdenes por request")
+
+    new, errors = [], []
+    for index, item in enumerate(items):
+        row, message = validate_order(item)
+        if message:
+            errors.append({"index": index, "message": message})
+        else:
+            new.append((index, row))
+    # una sola consulta IN para todos los usuarios del batch
+    known = existing_user_ids({row["user_id"] for _, row in new})
+    errors.extend(
+        {"index": index, "message": "user_id no existe"}
+        for index, row in new if row["user_id"] not in known
+    )
+    if errors:
+        errors.sort(key=lambda e: e["index"])
+        return make_error(
+            422, "validation_error", "Hay órdenes inválidas; no se creó ninguna", errors
+        )
+
+    new = [row for _, row in new]
+    # un solo INSERT multi-fila; RETURNING en el orden de los parámetros, o sea
+    # las órdenes en el orden recibido
+    created = db.session.execute(
+        insert(Order).returning(*rows.ORDER_COLUMNS, sort_by_parameter_order=True), new
+    ).all()
+    order_stats.add_orders(db.session.connection(), [r._mapping for r in created])
+    db.session.commit()
+
+    return jsonify({"items": rows.encode_rows(rows.encode_order, created)}), 201
+
+# -------- Filtros y orden de GET /orders --------
+# Cada combinación usa un índice (migración V8) con la igualdad por user_id
+# adelante y la columna de orden después, así el rango de esa columna y la
+# página son un recorrido del índice:
+#   created_at: ix_orders_created_id / ix_orders_user_created (con user_id)
+#   amount:     ix_orders_amount_id / ix_orders_user_amount
+#   id:         la PK / ix_orders_user_id
+# Un rango sobre una columna distinta de la del orden (p. ej. montos con
+# sort=created_at) se evalúa sobre las filas que recorre ese índice.
+
+ORDER_SORTS = {"created_at": Order.created_at, "amount": Order.amount, "id": Order.id}
+
+def parse_datetime(raw: str, end: bool = False) -> datetime:
+    """Fecha ISO 8601 en UTC sin zona (como se guarda); `end` con fecha sola: hasta fin del día."""
+    value = datetime.fromisoformat(raw)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and len(raw) == 10:
+        value += timedelta(days=1)
+    return value
+
+def parse_amount(raw: str) -> float:
+    value = float(raw)
+    if not math.isfinite(value):
+        raise ValueError
+    return value
+
+ORDER_FILTERS = {
+    # nombre -> (parser, descripción para el error)
+    "user_id": (int, "un entero"),
+    "created_from": (parse_datetime, "una fecha ISO 8601"),
+    "created_to": (lambda raw: parse_datetime(raw, end=True), "una fecha ISO 8601"),
+    "min_amount": (parse_amount, "un número"),
+    "max_amount": (parse_amount, "un número"),
+}
+
+def parse_order_filters():
+    """Lee los filtros de GET /orders. Devuelve (condiciones, valores, error).
+
+    created_from es inclusivo y created_to exclusivo (una fecha sola incluye
+    ese día completo); min_amount y max_amount son inclusivos.
+    """
+    values = {}
+    for name, (parse, expected) in ORDER_FILTERS.items():
+        raw = (request.args.get(name) or "").strip()
+        if not raw:
+            continue
+        try:
+            values[name] = parse(raw)
+        except ValueError:
+            return None, None, make_error(400, "bad_request", f"{name} debe ser {expected}")
+
+    created = sort_key(Order.created_at)
+    conditions = []
+    if "user_id" in values:
+        conditions.append(Order.user_id == values["user_id"])
+    if "created_from" in values:
+        conditions.append(created >= key_value(Order.created_at, values["created_from"]))
+    if "created_to" in values:
+        conditions.append(created < key_value(Order.created_at, values["created_to"]))
+    if "min_amount" in values:
+        conditions.append(Order.amount >= values["min_amount"])
+    if "max_amount" in values:
+        conditions.append(Order.amount <= values["max_amount"])
+    return conditions, values, None
+
 @bp.get("/orders")
+@plans.view
+@versions.conditional("orders", "users")
 @swag_from({
   "tags": ["Orders"],
   "summary": "Listar pedidos (paginado, incluye usuario)",
   "parameters": [
     {"in": "query", "name": "page", "type": "integer", "default": 1},
     {"in": "query", "name": "limit", "type": "integer", "default": 10},
-    {"in": "query", "name": "q", "type": "string", "description": "Filtrar por nombre de producto (búsqueda parcial)"}
+    {"in": "query", "name": "q", "type": "string",
+     "description": "Filtrar por nombre de producto (búsqueda parcial)"},
+    {"in": "query", "name": "user_id", "type": "integer",
+     "description": "Solo los pedidos de este usuario"},
+    {"in": "query", "name": "created_from", "type": "string", "format": "date-time",
+     "description": "Creados desde esta fecha (inclusive, ISO 8601)"},
+    {"in": "query", "name": "created_to", "type": "string", "format": "date-time",
+     "description": "Creados antes de esta fecha (exclusivo, ISO 8601); una fecha sola incluye"
+                    " ese día"},
+    {"in": "query", "name": "min_amount", "type": "number",
+     "description": "Monto mínimo (inclusive)"},
+    {"in": "query", "name": "max_amount", "type": "number",
+     "description": "Monto máximo (inclusive)"},
+    {"in": "query", "name": "sort", "type": "string",
+     "enum": ["created_at", "-created_at", "amount", "-amount", "id", "-id"],
+     "default": "-created_at",
+     "description": "Orden (- = descendente); los empates se ordenan por id"},
+    {"in": "query", "name": "cursor", "type": "string",
+     "description": "Paginación por cursor: vacío para la primera página, luego el next_cursor"
+                    " recibido (ignora page; mantener el mismo sort)"},
+    {"in": "query", "name": "count", "type": "string", "enum": ["exact", "estimate", "none"],
+     "default": "exact",
+     "description": "Cálculo de total/pages: exacto, estimado (cacheado unos segundos) o ninguno"
+                    " (solo has_more)"}
   ],
-  "responses": {"200": {"description": "OK"}}
+  "responses": {"200": {"description": "OK"}, "400": {"description": "Parámetro inválido"}}
 })
 def list_orders():
     page, limit, err = parse_pagination()
-    if err: return err
+    if err:
+        return err
+    sort, desc, err = parse_sort(ORDER_SORTS, "-created_at")
+    if err:
+        return err
+    use_cursor, position, err = parse_cursor(sort)
+    if err:
+        return err
+    count_mode, err = parse_count_mode()
+    if err:
+        return err
+    conditions, filters, err = parse_order_filters()
+    if err:
+        return err
 
     q = (request.args.get("q") or "").strip()
-    query = (Order.query.options(selectinload(Order.user)))
+    stmt = rows.orders_select(with_user=True).where(*conditions)
     if q:
-        like = f"%{q}%"
-        query = query.filter(Order.product_name.ilike(like))
-
-    query = query.order_by(Order.created_at.desc())
-    total = query.count()
-    items = query.offset((page-1)*limit).limit(limit).all()
-
-    data = [{
-        "id": o.id,
-        "user_id": o.user_id,
-        "product_name": o.product_name,
-        "amount": float(o.amount),
-        "created_at": o.created_at.isoformat(),
-        "user": {
-            "id": o.user.id,
-            "name": o.user.name,
-            "email": o.user.email
-        } if o.user else None
-    } for o in items]
+        stmt = stmt.where((yield from search.text_filter(Order, q)))
 
-    return jsonify({
-        "items": data,
-        "page": page,
-        "limit": limit,
-        "total": total,
-        "pages": (total + limit - 1)//limit
-    }), 200
+    if use_cursor:
+        items, next_cursor = yield from cursor_page(stmt, sort, Order.id, position, limit, desc)
+    else:
+        stmt = seek(stmt, sort_key(sort), Order.id, None, desc)
+        count_key = ("orders", q, *sorted(filters.items()))
+        items, total, has_more = yield from offset_page(stmt, page, limit, count_mode, count_key)
+
+    data = rows.encode_rows(rows.encode_order_user, items)
+    if use_cursor:
+        return jsonify({"items": data, "limit": limit, "next_cursor": next_cursor}), 200
+    return jsonify(page_body(data, page, limit, total, has_more)), 200
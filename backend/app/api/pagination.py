@@ -0,0 +1,175 @@
+# app/api/pagination.py
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from flask import request
+from sqlalchemy import String, tuple_, type_coerce
+
+from ..errors import make_error
+from ..extensions import db
+from ..services import counts
+
+
+def parse_pagination():
+    try:
+        page = int(request.args.get("page", 1))
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return None, None, make_error(400, "bad_request", "page y limit deben ser enteros")
+    page = max(1, page)
+    limit = min(max(1, limit), 100)
+    return page, limit, None
+
+
+# -------- Conteo del total --------
+# ?count=exact (por defecto) cuenta siempre; estimate usa un COUNT memoizado
+# unos segundos por filtro; none no cuenta y solo informa has_more.
+# total/pages se incluyen solo cuando se calcularon.
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+def parse_count_mode():
+    mode = (request.args.get("count") or "exact").strip().lower()
+    if mode not in COUNT_MODES:
+        return None, make_error(400, "bad_request", "count debe ser exact, estimate o none")
+    return mode, None
+
+
+def offset_page(stmt, page: int, limit: int, count_mode: str, count_key):
+    """Plan de una página por offset de un SELECT. Devuelve (filas, total | None, has_more)."""
+    total = None
+    if count_mode == "exact":
+        total = (yield counts.count_select(stmt))[0][0]
+    elif count_mode == "estimate":
+        total = counts.cached(count_key)
+        if total is None:
+            total = (yield counts.count_select(stmt))[0][0]
+            counts.store(count_key, total)
+
+    if count_mode == "exact":
+        rows = yield stmt.offset((page - 1) * limit).limit(limit)
+        return rows, total, page * limit < total
+    # sin total exacto, una fila extra alcanza para saber si hay página siguiente
+    rows = yield stmt.offset((page - 1) * limit).limit(limit + 1)
+    return rows[:limit], total, len(rows) > limit
+
+
+def page_body(data, page: int, limit: int, total, has_more: bool) -> dict:
+    body = {"items": data, "page": page, "limit": limit, "has_more": has_more}
+    if total is not None:
+        body["total"] = total
+        body["pages"] = (total + limit - 1) // limit
+    return body
+
+
+# -------- Cursor (keyset) --------
+# El cursor es opaco para el cliente: base64 de [clave, id] de la última fila
+# entregada. La página siguiente se pide con "(clave, id) < cursor", que el
+# índice resuelve con un seek: la página 10.000 cuesta lo mismo que la 1 y no
+# se repiten/saltan filas aunque haya inserciones entre páginas.
+
+
+def parse_cursor(column):
+    """Lee ?cursor= de un listado ordenado por `column`.
+
+    Devuelve (activo, posición, error); `cursor=` vacío = primera página.
+    """
+    if "cursor" not in request.args:
+        return False, None, None
+    token = request.args["cursor"].strip()
+    if not token:
+        return True, None, None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        key, last_id = json.loads(raw)
+        if not isinstance(key, (str, int, float)) or not isinstance(last_id, int):
+            raise ValueError
+        key = cursor_value(column, key)
+    except (ValueError, TypeError, ArithmeticError):
+        return True, None, make_error(400, "bad_request", "cursor inválido")
+    return True, (key, last_id), None
+
+
+def cursor_value(column, key):
+    """Clave leída del cursor (JSON) con el tipo con que se compara sort_key(column)."""
+    python_type = column.type.python_type
+    if python_type is Decimal:
+        return Decimal(str(key))
+    if python_type is int and not isinstance(key, int):
+        raise ValueError
+    if python_type is datetime:
+        value = datetime.fromisoformat(key)
+        # en SQLite el cursor trae el texto guardado, que se compara tal cual
+        return key if db.engine.dialect.name == "sqlite" else value
+    return key
+
+
+def encode_cursor(key, last_id: int) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    elif not isinstance(key, (str, int, float)):
+        key = str(key)  # Decimal
+    raw = json.dumps([key, last_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def sort_key(column):
+    """Expresión con la que se ordena, compara y serializa la clave del cursor."""
+    if db.engine.dialect.name == "sqlite" and column.type.python_type is datetime:
+        # SQLite guarda DateTime como texto (con o sin microsegundos según quién
+        # insertó); comparamos ese texto tal cual para que el seek sea exacto.
+        return type_coerce(column, String)
+    return column
+
+
+def key_value(column, value):
+    """`value` listo para comparar contra sort_key(column) (p. ej. en un filtro de rango)."""
+    if isinstance(value, datetime) and db.engine.dialect.name == "sqlite":
+        # mismo texto que guarda SQLite: sin microsegundos si son cero
+        return value.isoformat(sep=" ")
+    return value
+
+
+def seek(stmt, key, id_col, position, desc: bool = True):
+    """Aplica el orden (clave, id) y, si hay posición, el filtro de keyset."""
+    if position is not None:
+        bound = tuple_(key, id_col)
+        after = tuple_(*position)
+        stmt = stmt.where(bound < after if desc else bound > after)
+    if desc:
+        return stmt.order_by(key.desc(), id_col.desc())
+    return stmt.order_by(key.asc(), id_col.asc())
+
+
+# -------- Orden --------
+# ?sort=campo (ascendente) o -campo (descendente). Los empates se desempatan
+# por id en el mismo sentido: el orden es total y (clave, id) sirve de cursor.
+
+
+def parse_sort(columns: dict, default: str):
+    """Lee ?sort= entre `columns` (nombre -> columna). Devuelve (columna, desc, error)."""
+    raw = (request.args.get("sort") or default).strip()
+    desc = raw.startswith("-")
+    column = columns.get(raw[1:] if desc else raw)
+    if column is None:
+        options = ", ".join(f"{name}, -{name}" for name in columns)
+        return None, None, make_error(400, "bad_request", f"sort debe ser uno de: {options}")
+    return column, desc, None
+
+
+def cursor_page(stmt, column, id_col, position, limit: int, desc: bool = True):
+    """Plan de una página de un SELECT en modo cursor. Devuelve (filas, next_cursor).
+
+    Las filas traen al final la columna extra cursor_key.
+    """
+    key = sort_key(column)
+    stmt = stmt.add_columns(key.label("cursor_key"))
+    rows = yield seek(stmt, key, id_col, position, desc).limit(limit + 1)
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.cursor_key, last._mapping[id_col.key])
+    return rows[:limit], next_cursor
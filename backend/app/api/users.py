@@ -1,24 +1,29 @@
 # app/api/users.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, jsonify, request
+from sqlalchemy import insert, select, true
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, or_
+
+from .. import plans
+from ..apidocs import swag_from
+from ..errors import UNIQUE_VIOLATION, make_error, violated
 from ..extensions import db
-from ..models import User, Order
-from ..errors import make_error
-from flasgger import swag_from
+from ..models import Order, User, UserOrderStats
+from ..models.user import EMAIL_RE
+from ..services import order_stats, rows, search, versions
+from .pagination import (
+    cursor_page,
+    encode_cursor,
+    offset_page,
+    page_body,
+    parse_count_mode,
+    parse_cursor,
+    parse_pagination,
+    seek,
+    sort_key,
+)
 
 bp = Blueprint("users", __name__)
 
-def parse_pagination():
-    try:
-        page = int(request.args.get("page", 1))
-        limit = int(request.args.get("limit", 10))
-    except ValueError:
-        return None, None, make_error(400, "bad_request", "page y limit deben ser enteros")
-    page = max(1, page)
-    limit = min(max(1, limit), 100)
-    return page, limit, None
-
 @bp.post("/users")
 @swag_from({
   "tags": ["Users"],
@@ -54,16 +59,21 @@ def create_user():
 
     if not name or not email:
         return make_error(422, "validation_error", "name y email son obligatorios")
-    # Validación simple de email (complementa a la del modelo)
-    if "@" not in email or "." not in email:
+    # misma validación que el modelo (el INSERT Core no pasa por @validates)
+    if not EMAIL_RE.fullmatch(email):
         return make_error(422, "validation_error", "Formato de email inválido")
 
+    # INSERT ... RETURNING: id y created_at vuelven en la misma sentencia, sin
+    # SELECT de refresco después del commit; el duplicado lo detecta el UNIQUE
     try:
-        user = User(name=name, email=email)
-        db.session.add(user)
+        user = db.session.execute(
+            insert(User).values(name=name, email=email).returning(*rows.USER_COLUMNS)
+        ).one()
         db.session.commit()
-    except IntegrityError:
+    except IntegrityError as e:
         db.session.rollback()
+        if not violated(e, UNIQUE_VIOLATION):
+            raise
         return make_error(409, "duplicate_email", "El email ya existe")
 
     return jsonify({
@@ -73,64 +83,159 @@ def create_user():
         "created_at": user.created_at.isoformat()
     }), 201
 
+def wants_stats() -> bool:
+    return (request.args.get("include") or "").strip().lower() == "stats"
+
 @bp.get("/users")
+@plans.view
+@versions.conditional(lambda: ("users", "orders") if wants_stats() else ("users",))
 @swag_from({
   "tags": ["Users"],
   "summary": "Listar usuarios (paginado)",
   "parameters": [
     {"in": "query", "name": "page", "type": "integer", "default": 1},
     {"in": "query", "name": "limit", "type": "integer", "default": 10},
-    {"in": "query", "name": "q", "type": "string", "description": "Buscar usuarios por nombre o email"}
+    {"in": "query", "name": "q", "type": "string",
+     "description": "Buscar usuarios por nombre o email"},
+    {"in": "query", "name": "cursor", "type": "string",
+     "description": "Paginación por cursor: vacío para la primera página, luego el next_cursor"
+                    " recibido (ignora page)"},
+    {"in": "query", "name": "count", "type": "string", "enum": ["exact", "estimate", "none"],
+     "default": "exact",
+     "description": "Cálculo de total/pages: exacto, estimado (cacheado unos segundos) o ninguno"
+                    " (solo has_more)"},
+    {"in": "query", "name": "include", "type": "string", "enum": ["stats"],
+     "description": "stats: agrega order_count, total_spent, avg_ticket y last_order_at a cada"
+                    " usuario"}
   ],
   "responses": {"200": {"description": "OK"}}
 })
 def list_users():
     page, limit, err = parse_pagination()
-    if err: return err
+    if err:
+        return err
+    use_cursor, position, err = parse_cursor(User.created_at)
+    if err:
+        return err
+    count_mode, err = parse_count_mode()
+    if err:
+        return err
 
     q = (request.args.get("q") or "").strip()
-    query = User.query
+    stmt = rows.users_select(with_stats=wants_stats())
     if q:
-        like = f"%{q}%"
-        query = query.filter(or_(User.name.ilike(like), User.email.ilike(like)))
+        stmt = stmt.where((yield from search.text_filter(User, q)))
 
-    query = query.order_by(User.created_at.desc())
-    total = query.count()
-    items = query.offset((page-1)*limit).limit(limit).all()
+    if use_cursor:
+        items, next_cursor = yield from cursor_page(
+            stmt, User.created_at, User.id, position, limit
+        )
+    else:
+        stmt = stmt.order_by(User.created_at.desc(), User.id.desc())
+        items, total, has_more = yield from offset_page(
+            stmt, page, limit, count_mode, ("users", q)
+        )
 
-    data = [{
-        "id": u.id,
-        "name": u.name,
-        "email": u.email,
-        "created_at": u.created_at.isoformat(),
-    } for u in items]
+    encode = rows.encode_user_stats if wants_stats() else rows.encode_user
+    data = rows.encode_rows(encode, items)
+    if use_cursor:
+        return jsonify({"items": data, "limit": limit, "next_cursor": next_cursor}), 200
+    return jsonify(page_body(data, page, limit, total, has_more)), 200
 
-    return jsonify({
-        "items": data,
-        "page": page,
-        "limit": limit,
-        "total": total,
-        "pages": (total + limit - 1)//limit
-    }), 200
+def user_orders_select(user_id: int, limit: int, offset: int = 0, position=None,
+                       use_cursor=False):
+    """Una página de órdenes del usuario y su existencia en una sola consulta.
+
+    users LEFT JOIN (órdenes del usuario ordenadas por created_at desc, id desc
+    y limitadas a la página) LEFT JOIN user_order_stats: sin filas, el usuario
+    no existe; una fila con id NULL, existe pero la página está vacía. La
+    subconsulta recorre ix_orders_user_created a partir de la posición pedida.
+    Columnas: las de rows.orders_select, luego order_count y cursor_key.
+    """
+    key = sort_key(Order.created_at)
+    inner = (rows.orders_select().add_columns(key.label("cursor_key"))
+             .where(Order.user_id == user_id))
+    inner = seek(inner, key, Order.id, position if use_cursor else None)
+    page = inner.offset(offset).limit(limit + 1).subquery()
+    return (
+        select(*(page.c[c.key] for c in rows.ORDER_COLUMNS), UserOrderStats.order_count,
+               page.c.cursor_key)
+        .select_from(User)
+        .outerjoin(page, true())
+        .outerjoin(UserOrderStats, UserOrderStats.user_id == User.id)
+        .where(User.id == user_id)
+        .order_by(page.c.cursor_key.desc(), page.c.id.desc())
+    )
 
 @bp.get("/users/<int:user_id>/orders")
+@plans.view
+@versions.conditional("users", "orders")
 @swag_from({
   "tags": ["Users"],
-  "summary": "Listar pedidos de un usuario",
-  "parameters": [{"in": "path", "name": "user_id", "type": "integer", "required": True}],
+  "summary": "Listar pedidos de un usuario (paginado, más recientes primero)",
+  "parameters": [
+    {"in": "path", "name": "user_id", "type": "integer", "required": True},
+    {"in": "query", "name": "page", "type": "integer", "default": 1},
+    {"in": "query", "name": "limit", "type": "integer", "default": 10},
+    {"in": "query", "name": "cursor", "type": "string",
+     "description": "Paginación por cursor: vacío para la primera página, luego el next_cursor"
+                    " recibido (ignora page)"},
+    {"in": "query", "name": "count", "type": "string", "enum": ["exact", "estimate", "none"],
+     "default": "exact",
+     "description": "exact/estimate: total y pages (del resumen precalculado del usuario); none:"
+                    " solo has_more"}
+  ],
   "responses": {"200": {"description": "OK"}, "404": {"description": "Usuario no encontrado"}}
 })
 def list_user_orders(user_id: int):
-    user = User.query.get(user_id)
-    if not user:
+    page, limit, err = parse_pagination()
+    if err:
+        return err
+    use_cursor, position, err = parse_cursor(Order.created_at)
+    if err:
+        return err
+    count_mode, err = parse_count_mode()
+    if err:
+        return err
+
+    offset = 0 if use_cursor else (page-1)*limit
+    found = yield user_orders_select(user_id, limit, offset, position, use_cursor)
+    if not found:
         return make_error(404, "user_not_found", "Usuario no encontrado")
 
-    orders = Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
-    data = [{
-        "id": o.id,
-        "user_id": o.user_id,
-        "product_name": o.product_name,
-        "amount": o.amount,
-        "created_at": o.created_at.isoformat()
-    } for o in orders]
-    return jsonify({"items": data, "total": len(data)}), 200
+    items = [r for r in found if r.id is not None]
+    data = rows.encode_rows(rows.encode_user_order, items[:limit])
+    if use_cursor:
+        next_cursor = None
+        if len(items) > limit:
+            last = items[limit - 1]
+            next_cursor = encode_cursor(last.cursor_key, last.id)
+        return jsonify({"items": data, "limit": limit, "next_cursor": next_cursor}), 200
+
+    # el total sale del resumen materializado: no hace falta COUNT sobre orders
+    total = None if count_mode == "none" else (found[0].order_count or 0)
+    return jsonify(page_body(data, page, limit, total, len(items) > limit)), 200
+
+@bp.get("/users/<int:user_id>/summary")
+@plans.view
+@versions.conditional("users", "orders")
+@swag_from({
+  "tags": ["Users"],
+  "summary": "Resumen de pedidos de un usuario",
+  "description": (
+    "Cantidad de pedidos, total gastado, ticket promedio y fecha del último pedido (precalculados)."
+  ),
+  "parameters": [{"in": "path", "name": "user_id", "type": "integer", "required": True}],
+  "responses": {"200": {"description": "OK"}, "404": {"description": "Usuario no encontrado"}}
+})
+def user_summary(user_id: int):
+    found = yield (
+        select(User.id, UserOrderStats.order_count, UserOrderStats.total_amount,
+               UserOrderStats.last_order_at)
+        .outerjoin(UserOrderStats, UserOrderStats.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    if not found:
+        return make_error(404, "user_not_found", "Usuario no encontrado")
+    row = found[0]
+    return jsonify({"user_id": row.id, **order_stats.summary(*row[1:])}), 200
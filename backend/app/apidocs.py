@@ -0,0 +1,123 @@
+# app/apidocs.py
+# Documentación OpenAPI (UI en /apidocs, spec en /apispec_1.json) según SWAGGER_MODE:
+# - dynamic: flasgger arma el spec en cada request a partir de los swag_from y
+#   docstrings YAML de las vistas (desarrollo: refleja los cambios al instante);
+# - static: sirve el JSON generado en el build (`flask openapi-dump`) como
+#   archivo con ETag/Cache-Control, sin importar flasgger ni sus dependencias
+#   (jsonschema, yaml, mistune) en los workers; si el archivo no existe, la
+#   app no arranca (el build lo genera, ver backend/package.json);
+# - off: sin documentación.
+# Las vistas usan el swag_from de este módulo: guarda el dict igual que el de
+# flasgger (atributo specs_dict) sin importarlo.
+import importlib.util
+import json
+import os
+
+from flask import Response, send_from_directory
+
+SWAGGER_CONFIG = {"title": "Fullstack Challenge API", "uiversion": 3}
+SPEC_ROUTE = "/apispec_1.json"
+SPEC_FILE = "openapi.json"  # en app/static/
+SPEC_MAX_AGE = 3600
+
+# misma UI que flasgger (sus assets se sirven desde el paquete instalado)
+UI_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head>
+  <meta charset="UTF-8">
+  <title>{title}</title>
+  <link rel="stylesheet" href="/flasgger_static/swagger-ui.css">
+  <link rel="icon" type="image/png" href="/flasgger_static/favicon-32x32.png">
+</head>
+<body>
+  <div id="swagger-ui"></div>
+  <script src="/flasgger_static/swagger-ui-bundle.js"></script>
+  <script src="/flasgger_static/swagger-ui-standalone-preset.js"></script>
+  <script>
+    window.onload = function () {{
+      window.ui = SwaggerUIBundle({{
+        url: "{spec}",
+        dom_id: "#swagger-ui",
+        deepLinking: true,
+        displayOperationId: true,
+        presets: [SwaggerUIBundle.presets.apis, SwaggerUIStandalonePreset],
+        plugins: [SwaggerUIBundle.plugins.DownloadUrl],
+        layout: "StandaloneLayout"
+      }});
+    }};
+  </script>
+</body>
+</html>
+"""
+
+
+def swag_from(specs: dict):
+    """Asocia el spec OpenAPI (dict) a la vista, como flasgger.swag_from sin validación."""
+
+    def decorator(view):
+        view.specs_dict = specs
+        return view
+
+    return decorator
+
+
+def spec_path(app) -> str:
+    return os.path.join(app.static_folder, SPEC_FILE)
+
+
+def _dynamic(app):
+    from flasgger import Swagger
+
+    app.config["SWAGGER"] = SWAGGER_CONFIG
+    return Swagger(app)
+
+
+def _static(app):
+    ui_static = os.path.join(
+        importlib.util.find_spec("flasgger").submodule_search_locations[0], "ui3", "static"
+    )
+    ui_html = UI_HTML.format(title=SWAGGER_CONFIG["title"], spec=SPEC_ROUTE)
+
+    @app.get(SPEC_ROUTE, endpoint="apidocs_spec")
+    def apidocs_spec():
+        return send_from_directory(app.static_folder, SPEC_FILE, max_age=SPEC_MAX_AGE)
+
+    @app.get("/apidocs/", endpoint="apidocs_ui")
+    def apidocs_ui():
+        return Response(ui_html, mimetype="text/html")
+
+    @app.get("/flasgger_static/<path:filename>", endpoint="apidocs_static")
+    def apidocs_static(filename):
+        return send_from_directory(ui_static, filename, max_age=SPEC_MAX_AGE)
+
+
+def init_app(app):
+    mode = app.config["SWAGGER_MODE"]
+    if mode == "off":
+        return
+    if mode == "static":
+        if not os.path.exists(spec_path(app)):
+            raise RuntimeError(
+                f"SWAGGER_MODE=static sin {spec_path(app)}: generarlo en el build con "
+                "`SWAGGER_MODE=off flask --app app:create_app openapi-dump` "
+                "(npm run build -w backend) o usar SWAGGER_MODE=dynamic|off"
+            )
+        _static(app)
+        return
+    _dynamic(app)
+
+
+def build_spec(app) -> dict:
+    """Arma el spec con flasgger (como en modo dynamic), p. ej. para guardarlo en el build."""
+    swagger = getattr(app, "swag", None) or _dynamic(app)
+    with app.test_request_context():
+        return swagger.get_apispecs(swagger.config["specs"][0]["endpoint"])
+
+
+def dump_spec(app, path: str | None = None) -> str:
+    path = path or spec_path(app)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(build_spec(app), fp, ensure_ascii=False, sort_keys=True, indent=1)
+        fp.write("\n")
+    return path
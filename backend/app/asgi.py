@@ -0,0 +1,164 @@
+# app/asgi.py
+# Modo ASGI opcional (`uvicorn asgi:app` desde backend/; el modo por defecto
+# sigue siendo WSGI con gunicorn). Los GET de las vistas escritas como planes
+# (listados, export y resumen de usuario, ver app/plans.py) se ejecutan en el
+# event loop con un engine SQLAlchemy async (aiosqlite / asyncpg): mientras
+# esperan a la DB no ocupan un hilo, así un proceso sostiene muchas más
+# lecturas en curso. El request pasa por la misma app Flask (before/after
+# request, ETag/304, gzip, métricas, manejo de errores); solo cambia quién
+# ejecuta los SELECT. El resto de las rutas (escrituras, jobs, docs, métricas)
+# corre como WSGI en un pool de ASGI_SYNC_THREADS hilos (a2wsgi).
+# Requiere requirements-async.txt.
+import io
+import sys
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from flask import g, request
+from flask.signals import request_started
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.exceptions import HTTPException
+
+from . import create_app, plans
+from .compression import gzip_stream_async
+from .config import engine_options
+from .engine import _pragma_listener, sqlite_pragmas
+from .routing import REPLICA_BIND
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """URL con el driver async equivalente (la de DATABASE_URL usa el sincrónico)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"sin driver async para {parsed.drivername}: definir ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_engines(config) -> dict:
+    """Engines async del primario y, si está configurada, de la réplica."""
+    urls = {None: config["ASYNC_DATABASE_URL"] or async_url(config["SQLALCHEMY_DATABASE_URI"])}
+    if config["DATABASE_READ_URL"]:
+        urls[REPLICA_BIND] = async_url(config["DATABASE_READ_URL"])
+    engines = {}
+    for bind, url in urls.items():
+        engine = create_async_engine(url, **engine_options(config, url))
+        if engine.dialect.name == "sqlite":
+            event.listen(engine.sync_engine, "connect", _pragma_listener(sqlite_pragmas(config)))
+        engines[bind] = engine
+    return engines
+
+
+class AsyncReadApp:
+    """App ASGI: planes de lectura en el event loop, el resto vía WSGI."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.engines = create_async_engines(flask_app.config)
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config["ASGI_SYNC_THREADS"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        plan_fn = self.plan_for(scope) if scope["type"] == "http" else None
+        if plan_fn is None:
+            await self.wsgi(scope, receive, send)
+            return
+        await self.serve(plan_fn, build_environ(scope, io.BytesIO()), send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for engine in self.engines.values():
+                    await engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def plan_for(self, scope):
+        """Plan de la vista que atiende el request, o None si no tiene versión async."""
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+        adapter = self.flask_app.url_map.bind("localhost", script_name=scope.get("root_path"))
+        try:
+            endpoint, _ = adapter.match(scope["path"], method=scope["method"])
+        except HTTPException:
+            return None  # 404/405/redirects: los resuelve Flask
+        return getattr(self.flask_app.view_functions.get(endpoint), "plan", None)
+
+    def engine(self):
+        if g.get("db_replica") and REPLICA_BIND in self.engines:
+            return self.engines[REPLICA_BIND]
+        return self.engines[None]
+
+    async def dispatch(self, plan_fn):
+        """Como Flask.full_dispatch_request, con el plan en lugar de la vista."""
+        app = self.flask_app
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                async with self.engine().connect() as conn:
+                    rv = await plans.run_async(plan_fn(**request.view_args), conn)
+        except Exception as e:
+            rv = app.handle_user_exception(e)
+        return app.finalize_request(rv)
+
+    async def serve(self, plan_fn, environ, send):
+        """Como Flask.wsgi_app: contexto del request, respuesta y teardown."""
+        app = self.flask_app
+        ctx = app.request_context(environ)
+        error = None
+        resp = None
+        try:
+            try:
+                ctx.push()
+                resp = await self.dispatch(plan_fn)
+            except Exception as e:
+                error = e
+                resp = app.handle_exception(e)
+            except:  # noqa: E722
+                error = sys.exc_info()[1]
+                raise
+            await self.send_response(resp, environ, send)
+        finally:
+            if resp is not None:
+                resp.close()
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+
+    async def send_response(self, resp, environ, send):
+        headers = resp.get_wsgi_headers(environ)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": resp.status_code,
+                "headers": [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers],
+            }
+        )
+        body_plan = getattr(resp, "body_plan", None)
+        if body_plan is None or environ["REQUEST_METHOD"] == "HEAD":
+            body = b"".join(resp.get_app_iter(environ))
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        # cuerpo en streaming: cada bloque se envía a medida que se lee
+        # (comprimido si after_request eligió gzip)
+        chunks = (chunk.encode() async for chunk in plans.drain_async(body_plan, self.engine()))
+        if headers.get("Content-Encoding") == "gzip":
+            chunks = gzip_stream_async(chunks, self.flask_app.config["COMPRESS_LEVEL"])
+        async for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def create_asgi_app():
+    return AsyncReadApp(create_app())
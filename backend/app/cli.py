@@ -1,17 +1,80 @@
-import click
+import time
 
+import click
 from flask import Flask
-from .seeds import seed_faker
-from .seeds.seed_basic import seed_basic
+
+from . import apidocs
 from .extensions import db
+from .routing import has_replica, sync_sqlite_replica
+from .services import idempotency, jobs
 
 
 def register_cli(app: Flask):
-    app.cli.add_command(seed_basic)
+    # los seeds (y Faker) se importan recién al ejecutar su comando, no al crear la app
+
+    @app.cli.command("seed-basic")
+    @click.pass_context
+    def seed_basic_cmd(ctx):
+        """Crea datos mínimos de prueba (idempotente simple)."""
+        from .seeds.seed_basic import seed_basic
+        ctx.invoke(seed_basic)
+
     @app.cli.command("seed-faker")
     @click.option("--users", default=20, help="Cantidad de usuarios")
     @click.option("--orders", default=60, help="Cantidad de órdenes")
-    def seed_faker_cmd(users, orders):
+    @click.option("--bulk", is_flag=True, help="Modo masivo (INSERT por lotes)")
+    @click.option("--batch-size", default=10_000, show_default=True, help="Filas por lote (--bulk)")
+    @click.option("--seed", default=1234, show_default=True, help="Semilla (--bulk)")
+    def seed_faker_cmd(users, orders, bulk, batch_size, seed):
         """Genera datos con Faker (no borra datos existentes)."""
-        res = seed_faker.run(users=users, orders=orders)
-        click.echo(f"Seeded: {res['users']} users, {res['orders']} orders")
+        from .seeds import seed_faker
+
+        if not bulk:
+            res = seed_faker.run(users=users, orders=orders)
+            click.echo(f"Seeded: {res['users']} users, {res['orders']} orders")
+            return
+
+        done = {"users": 0, "orders": 0}
+        started = time.perf_counter()
+
+        def progress(kind, n):
+            done[kind] += n
+            click.echo(f"  {kind}: {done[kind]}/{users if kind == 'users' else orders}")
+
+        try:
+            res = seed_faker.run_bulk(users, orders, batch_size=batch_size, seed=seed,
+                                      on_batch=progress)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Seeded: {res['users']} users, {res['orders']} orders "
+                   f"en {time.perf_counter() - started:.1f}s")
+
+    @app.cli.command("replica-sync")
+    def replica_sync_cmd():
+        """Copia la DB SQLite primaria a la réplica (DATABASE_READ_URL) en local."""
+        if not has_replica(app):
+            raise click.ClickException("DATABASE_READ_URL no está configurada")
+        try:
+            sync_sqlite_replica(db)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo("Réplica sincronizada")
+
+    @app.cli.command("idempotency-purge")
+    def idempotency_purge_cmd():
+        """Borra las Idempotency-Key vencidas (más viejas que IDEMPOTENCY_KEY_TTL horas)."""
+        click.echo(f"Claves borradas: {idempotency.purge()}")
+
+    @app.cli.command("jobs-cleanup")
+    def jobs_cleanup_cmd():
+        """Marca failed los jobs colgados y borra los jobs y archivos vencidos."""
+        res = jobs.cleanup()
+        click.echo(f"Jobs colgados: {res['reaped']}, jobs borrados: {res['jobs']}, "
+                   f"archivos borrados: {res['files']}")
+
+    @app.cli.command("openapi-dump")
+    @click.option("--output", default=None,
+                  help="Archivo de salida (por defecto app/static/openapi.json)")
+    def openapi_dump_cmd(output):
+        """Genera el spec OpenAPI que sirve SWAGGER_MODE=static (build, con SWAGGER_MODE=off)."""
+        click.echo(f"Spec OpenAPI: {apidocs.dump_spec(app, output)}")
@@ -0,0 +1,85 @@
+# app/compression.py
+# Compresión gzip negociada con Accept-Encoding para respuestas JSON/NDJSON/CSV.
+# - Respuestas en memoria: solo si superan COMPRESS_MIN_SIZE bytes.
+# - Respuestas en streaming (export NDJSON/CSV, archivos de jobs): se comprimen
+#   bloque a bloque con Z_SYNC_FLUSH, así el cliente sigue recibiendo datos a
+#   medida que se generan.
+# COMPRESS_LEVEL (1-9) permite cambiar ratio por CPU: 1 es el más rápido.
+import zlib
+
+from flask import current_app, request
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+# el ETag fuerte cambia con la codificación (ver versions.conditional)
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+def compressor(level: int):
+    return zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: formato gzip
+
+
+def _gzip_stream(chunks, level: int):
+    co = compressor(level)
+    for chunk in chunks:
+        data = co.compress(chunk) + co.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield co.flush()
+
+
+async def gzip_stream_async(chunks, level: int):
+    """Como _gzip_stream para un iterable async (cuerpos en streaming servidos por ASGI)."""
+    co = compressor(level)
+    async for chunk in chunks:
+        data = co.compress(chunk) + co.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield co.flush()
+
+
+def _should_compress(response) -> bool:
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    return request.method != "HEAD" and request.accept_encodings["gzip"] > 0
+
+
+def compress_response(response):
+    if not current_app.config["COMPRESS_ENABLED"]:
+        return response
+    response.vary.add("Accept-Encoding")
+    if not _should_compress(response):
+        return response
+
+    level = current_app.config["COMPRESS_LEVEL"]
+    if response.is_streamed or response.direct_passthrough:
+        original = response.response
+        response.response = _gzip_stream(response.iter_encoded(), level)
+        response.direct_passthrough = False
+        if hasattr(original, "close"):
+            response.call_on_close(original.close)
+        response.headers.pop("Content-Length", None)
+        response.headers.pop("Accept-Ranges", None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+            return response
+        co = compressor(level)
+        response.set_data(co.compress(data) + co.flush())
+
+    response.headers["Content-Encoding"] = "gzip"
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + GZIP_ETAG_SUFFIX, weak)
+    return response
+
+
+def init_app(app):
+    app.after_request(compress_response)
@@ -5,20 +5,107 @@ class BaseConfig:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Réplica de lectura opcional para los GET de listados y export (ver app/routing.py)
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+    # segundos que un cliente lee del primario después de escribir
+    READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    # Modo ASGI (asgi.py): URL async de la DB; por defecto se deriva de DATABASE_URL
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+    # hilos para las rutas sincrónicas (escrituras, jobs, métricas) en modo ASGI
+    ASGI_SYNC_THREADS = int(os.getenv("ASGI_SYNC_THREADS", "10"))
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173")
+    # Pool de conexiones por proceso (no aplica a SQLite en memoria).
+    # pre-ping y recycle solo tienen sentido con un servidor de DB (Postgres).
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+    # PRAGMAs de SQLite al abrir cada conexión (ver app/engine.py)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negativo: KiB
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "1") == "1"
+    # Filas por bloque en los export streaming (NDJSON)
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+    # Filas por bloque (y por commit) en los import
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+    # ?count=estimate: segundos que se reutiliza un COUNT por filtro
+    COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+    COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1024"))
+    # ?q=: segundos entre consultas de si existe el índice FTS (ver services/search.py)
+    SEARCH_FTS_CHECK_TTL = float(os.getenv("SEARCH_FTS_CHECK_TTL", "30"))
+    # Compresión gzip de respuestas (Accept-Encoding)
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    # Documentación OpenAPI: dynamic (flasgger), static (spec de `flask openapi-dump`) u off
+    SWAGGER_MODE = os.getenv("SWAGGER_MODE", "dynamic")
+    # Métricas Prometheus en /metrics (multiproceso con PROMETHEUS_MULTIPROC_DIR)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    # Detector de N+1 y consultas lentas (ver app/query_guard.py)
+    QUERY_GUARD_ENABLED = os.getenv("QUERY_GUARD_ENABLED", "0") == "1"
+    QUERY_GUARD_REPEAT_THRESHOLD = int(os.getenv("QUERY_GUARD_REPEAT_THRESHOLD", "5"))
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # 0 desactiva
+    # Jobs en segundo plano: hilos por proceso y carpeta de archivos (def.: instance/jobs)
+    JOBS_MAX_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+    JOBS_DIR = os.getenv("JOBS_DIR")
+    JOBS_EAGER = False  # True: se ejecutan dentro del request (tests)
+    # queued/running sin progreso en estos minutos: el proceso murió (se marcan failed)
+    JOBS_STALE_MINUTES = float(os.getenv("JOBS_STALE_MINUTES", "30"))
+    # horas que se guardan los jobs terminados y sus archivos
+    JOBS_RESULT_TTL = float(os.getenv("JOBS_RESULT_TTL", "24"))
+    # POST /orders/batch: órdenes por request (una sola consulta IN para los usuarios)
+    ORDERS_BATCH_MAX = int(os.getenv("ORDERS_BATCH_MAX", "500"))
+    # horas que se guarda la respuesta de cada Idempotency-Key
+    IDEMPOTENCY_KEY_TTL = float(os.getenv("IDEMPOTENCY_KEY_TTL", "24"))
 
 
 class DevConfig(BaseConfig):
     DEBUG = True
+    QUERY_GUARD_ENABLED = os.getenv("QUERY_GUARD_ENABLED", "1") == "1"
+    # un solo proceso con el servidor de desarrollo: pool chico
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "2"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "3"))
 
 
 class TestConfig(BaseConfig):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    JOBS_EAGER = True
+    QUERY_GUARD_ENABLED = True
 
 
 class ProdConfig(BaseConfig):
     DEBUG = False
+    # por worker de gunicorn (hilos + jobs en segundo plano)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    # spec generado en el build: los workers no importan ni ejecutan flasgger
+    SWAGGER_MODE = os.getenv("SWAGGER_MODE", "static")
+
+
+def is_memory_sqlite(uri: str) -> bool:
+    return uri.startswith("sqlite") and (":memory:" in uri or uri.rstrip("/") == "sqlite:")
+
+
+def engine_options(config, uri: str | None = None) -> dict:
+    """Opciones de engine a partir del perfil de pool del entorno."""
+    uri = uri or config["SQLALCHEMY_DATABASE_URI"]
+    if is_memory_sqlite(uri):
+        return {}  # StaticPool: una sola conexión compartida, sin pool que dimensionar
+    options = {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+    }
+    if not uri.startswith("sqlite"):
+        options["pool_recycle"] = config["DB_POOL_RECYCLE"]
+        options["pool_pre_ping"] = config["DB_POOL_PRE_PING"]
+    return options
 
 
 def load_config(app):
@@ -29,3 +116,8 @@ def load_config(app):
         app.config.from_object(TestConfig)
     else:
         app.config.from_object(DevConfig)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    read_url = app.config["DATABASE_READ_URL"]
+    if read_url:
+        binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+        binds.setdefault("replica", {"url": read_url, **engine_options(app.config, read_url)})
@@ -0,0 +1,66 @@
+# app/engine.py
+# Ajustes de conexión a la DB. El pool se dimensiona en config.py
+# (SQLALCHEMY_ENGINE_OPTIONS); acá se aplican los PRAGMAs de SQLite a cada
+# conexión nueva y se informa la configuración efectiva al arrancar:
+# - journal_mode=WAL: los lectores no bloquean al escritor ni viceversa, así
+#   varios workers de gunicorn no chocan con "database is locked";
+# - synchronous=NORMAL: en WAL un commit no espera fsync (sigue siendo seguro
+#   ante caídas del proceso; ante un corte de luz se pueden perder los últimos);
+# - busy_timeout: un escritor espera al otro en lugar de fallar enseguida;
+# - cache_size / mmap_size: más páginas en memoria por conexión;
+# - foreign_keys=ON: SQLite no aplica FKs (ni ON DELETE CASCADE) si no se pide.
+import logging
+
+from sqlalchemy import event
+
+from .extensions import db
+
+
+def sqlite_pragmas(config) -> dict:
+    return {
+        "journal_mode": config["SQLITE_JOURNAL_MODE"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT"],
+        "cache_size": config["SQLITE_CACHE_SIZE"],
+        "mmap_size": config["SQLITE_MMAP_SIZE"],
+        "foreign_keys": "ON" if config["SQLITE_FOREIGN_KEYS"] else "OFF",
+    }
+
+
+def _pragma_listener(pragmas: dict):
+    def set_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return set_pragmas
+
+
+def _report_logger(app) -> logging.Logger:
+    # el logger de Flask queda en WARNING fuera de debug; el reporte de
+    # arranque se quiere ver también en producción (log de gunicorn)
+    logger = app.logger.getChild("engine")
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def init_app(app):
+    with app.app_context():
+        engines = dict(db.engines)
+    logger = _report_logger(app)
+    for bind, engine in engines.items():
+        pragmas = {}
+        if engine.dialect.name == "sqlite":
+            pragmas = sqlite_pragmas(app.config)
+            event.listen(engine, "connect", _pragma_listener(pragmas))
+        logger.info(
+            "DB %s: %s pool=%s opciones=%s pragmas=%s",
+            bind or "default",
+            engine.url.render_as_string(hide_password=True),
+            type(engine.pool).__name__,
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"],
+            pragmas,
+        )
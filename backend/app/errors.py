@@ -1,5 +1,7 @@
 # app/errors.py
 from flask import jsonify
+from sqlalchemy.exc import IntegrityError
+
 
 def make_error(status: int, code: str, message: str, details=None):
     payload = {"error": {"code": code, "message": message}}
@@ -7,6 +9,16 @@ def make_error(status: int, code: str, message: str, details=None):
         payload["error"]["details"] = details
     return jsonify(payload), status
 
+# SQLSTATE (Postgres) y texto del error (SQLite) de cada violación
+FOREIGN_KEY_VIOLATION = ("23503", "FOREIGN KEY constraint failed")
+UNIQUE_VIOLATION = ("23505", "UNIQUE constraint failed")
+
+def violated(exc: IntegrityError, violation) -> bool:
+    """True si el IntegrityError corresponde a `violation` (FOREIGN_KEY_/UNIQUE_VIOLATION)."""
+    orig = exc.orig
+    code, text = violation
+    return getattr(orig, "pgcode", None) == code or text in str(orig)
+
 def register_error_handlers(app):
     @app.errorhandler(400)
     def bad_request(e):
@@ -2,6 +2,9 @@ from flask_cors import CORS
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from .routing import RoutingSession
+
+# la Session elige primario o réplica de lectura por request (ver routing.py)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 cors = CORS()
@@ -0,0 +1,32 @@
+# app/json_provider.py
+# JSON provider de la app: igual al de Flask, pero acepta fragmentos ya
+# codificados (RawJSON) como valores del primer nivel de un dict. Así un
+# listado arma {"items": RawJSON(...), "page": ...} y solo se codifica el
+# sobre; las filas se insertan tal cual (ver services/rows.py).
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+COMPACT = (",", ":")
+
+
+class RawJSON(str):
+    """Texto JSON válido que se inserta sin volver a codificar."""
+
+
+class JSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        if not (isinstance(obj, dict) and any(isinstance(v, RawJSON) for v in obj.values())):
+            return super().dumps(obj, **kwargs)
+        if kwargs.get("indent") is not None or kwargs.get("separators") != COMPACT:
+            # salida con formato (modo debug): se decodifica para respetarlo
+            obj = {k: json.loads(v) if isinstance(v, RawJSON) else v for k, v in obj.items()}
+            return super().dumps(obj, **kwargs)
+
+        keys = sorted(obj) if kwargs.get("sort_keys", self.sort_keys) else obj
+        parts = []
+        for key in keys:
+            value = obj[key]
+            encoded = value if isinstance(value, RawJSON) else super().dumps(value, **kwargs)
+            parts.append(super().dumps(key, **kwargs) + ":" + encoded)
+        return "{" + ",".join(parts) + "}"
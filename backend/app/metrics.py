@@ -0,0 +1,171 @@
+# app/metrics.py
+# Métricas Prometheus (expuestas en GET /metrics, ver api/metrics.py):
+# - requests: latencia por endpoint/método/status (hasta que la vista devuelve
+#   la respuesta; en streaming no incluye el envío del body) y requests en curso;
+# - SQL: sentencias y tiempo por endpoint (histograma) y filas afectadas o
+#   devueltas según el rowcount que informe el driver (SQLite no lo informa
+#   para SELECT);
+# - pool: espera para obtener una conexión, conexiones en uso, capacidad
+#   (pool_size + max_overflow; saturación = en uso / capacidad) y timeouts.
+#
+# Con varios workers de gunicorn cada proceso escribe sus valores en
+# PROMETHEUS_MULTIPROC_DIR y /metrics los agrega (modo multiproceso de
+# prometheus_client); sin esa variable se usa el registro del proceso.
+import time
+
+from flask import g, has_request_context, request
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de los requests",
+    ["endpoint", "method", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests en curso",
+    ["endpoint"],
+    multiprocess_mode="livesum",
+)
+SQL_LATENCY = Histogram(
+    "db_statement_duration_seconds",
+    "Duración de cada sentencia SQL",
+    ["endpoint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+SQL_ROWS = Counter("db_statement_rows", "Filas afectadas/devueltas (rowcount)", ["endpoint"])
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera para obtener una conexión del pool",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Conexiones prestadas por el pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Conexiones máximas del pool (pool_size + max_overflow)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts", "Timeouts esperando una conexión", ["pool"])
+
+
+def _endpoint() -> str:
+    if has_request_context():
+        return request.endpoint or "unmatched"
+    return "background"
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide la espera de cada checkout y las conexiones en uso."""
+
+    # loguea como un QueuePool común: con el nombre del módulo (app.metrics...)
+    # sería hijo del logger de Flask ("app", en DEBUG en desarrollo)
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.QueuePool"
+    metrics_name = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_name = self.metrics_name
+        POOL_CAPACITY.labels(self._metrics_name).set(self.size() + self._max_overflow)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeout:
+            POOL_TIMEOUTS.labels(self._metrics_name).inc()
+            raise
+        finally:
+            POOL_WAIT.labels(self._metrics_name).observe(time.perf_counter() - start)
+        POOL_IN_USE.labels(self._metrics_name).inc()
+        return conn
+
+    def _do_return_conn(self, record):
+        POOL_IN_USE.labels(self._metrics_name).dec()
+        super()._do_return_conn(record)
+
+
+# -------- Eventos SQLAlchemy --------
+
+# una conexión ejecuta una sentencia a la vez; si falla no hay after_cursor_execute
+# y la marca queda hasta que la pisa la sentencia siguiente
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("metrics_start", None)
+    if start is None:
+        return
+    endpoint = _endpoint()
+    SQL_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+    if cursor.rowcount > 0:
+        SQL_ROWS.labels(endpoint).inc(cursor.rowcount)
+
+
+_EVENTS = (
+    (Engine, "before_cursor_execute", _before_cursor_execute),
+    (Engine, "after_cursor_execute", _after_cursor_execute),
+)
+
+
+# -------- Requests --------
+
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+    g.metrics_endpoint = _endpoint()
+    REQUESTS_IN_PROGRESS.labels(g.metrics_endpoint).inc()
+
+
+def _observe_request(response):
+    start = g.get("metrics_start")
+    if start is not None:
+        REQUEST_LATENCY.labels(g.metrics_endpoint, request.method, response.status_code).observe(
+            time.perf_counter() - start
+        )
+    return response
+
+
+def _end_request(exc):
+    if g.get("metrics_start") is not None:
+        REQUESTS_IN_PROGRESS.labels(g.metrics_endpoint).dec()
+
+
+def _timed_pool(bind: str) -> type:
+    """TimedQueuePool cuyas métricas llevan la etiqueta pool=`bind`."""
+    return type("TimedQueuePool", (TimedQueuePool,), {"metrics_name": bind})
+
+
+def _instrument_pools(config):
+    """Usa TimedQueuePool en los engines con pool dimensionado; antes de db.init_app."""
+    options = config["SQLALCHEMY_ENGINE_OPTIONS"]
+    if "pool_size" in options:
+        options.setdefault("poolclass", TimedQueuePool)
+    for key, bind in (config.get("SQLALCHEMY_BINDS") or {}).items():
+        if isinstance(bind, dict) and "pool_size" in bind:
+            bind.setdefault("poolclass", _timed_pool(key))
+
+
+def init_app(app):
+    if not app.config["METRICS_ENABLED"]:
+        return
+    _instrument_pools(app.config)
+    for target, name, fn in _EVENTS:
+        if not event.contains(target, name, fn):
+            event.listen(target, name, fn)
+    app.before_request(_start_request)
+    app.after_request(_observe_request)
+    app.teardown_request(_end_request)
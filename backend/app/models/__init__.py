@@ -1,2 +1,6 @@
+from .idempotency_key import IdempotencyKey  # noqa: F401
+from .job import Job  # noqa: F401
 from .order import Order  # noqa: F401
+from .table_version import TableVersion  # noqa: F401
 from .user import User  # noqa: F401
+from .user_order_stats import UserOrderStats  # noqa: F401
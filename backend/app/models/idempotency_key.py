@@ -0,0 +1,20 @@
+from sqlalchemy import func
+
+from ..extensions import db
+
+
+class IdempotencyKey(db.Model):
+    """Respuesta guardada de un POST con Idempotency-Key (ver services/idempotency.py)."""
+
+    __tablename__ = "idempotency_keys"
+
+    key = db.Column(db.String(255), primary_key=True)
+    # sha256 de método, ruta y body: la misma clave con otro request es un error
+    request_hash = db.Column(db.String(64), nullable=False)
+    # NULL mientras el request original está en curso
+    status_code = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey {self.key} status={self.status_code}>"
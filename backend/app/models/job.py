@@ -0,0 +1,28 @@
+from sqlalchemy import func
+
+from ..extensions import db
+
+
+class Job(db.Model):
+    """Import/export ejecutado en segundo plano (ver services/jobs.py)."""
+
+    __tablename__ = "jobs"
+
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)  # p. ej. import_users, export_all
+    status = db.Column(db.String(16), nullable=False, default="queued", index=True)
+    # parámetros de entrada (formato, archivo de entrada) y resultado del job
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    # contadores de progreso: filas procesadas / creadas / salteadas
+    processed = db.Column(db.Integer, nullable=False, default=0)
+    created = db.Column(db.Integer, nullable=False, default=0)
+    skipped = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Job id={self.id} kind={self.kind} status={self.status}>"
@@ -7,8 +7,16 @@ class Order(db.Model):
     __tablename__ = "orders"
     __table_args__ = (
         CheckConstraint("amount > 0", name="ck_orders_amount_positive"),
-        db.Index("ix_orders_user_created", "user_id", "created_at"),
+        db.Index("ix_orders_user_created", "user_id", "created_at", "id"),
+        db.Index("ix_orders_created_id", "created_at", "id"),
+        # filtros y orden de GET /orders (ver api/orders.py)
+        db.Index("ix_orders_amount_id", "amount", "id"),
+        db.Index("ix_orders_user_amount", "user_id", "amount", "id"),
+        db.Index("ix_orders_user_id", "user_id", "id"),
     )
+    # created_at (server_default) vuelve en el RETURNING del INSERT: el resumen
+    # de services/order_stats.py lo usa en el after_flush
+    __mapper_args__ = {"eager_defaults": True}
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
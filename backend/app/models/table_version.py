@@ -0,0 +1,14 @@
+from ..extensions import db
+
+
+class TableVersion(db.Model):
+    """Generación de escritura por tabla (validador barato para ETag/Last-Modified)."""
+
+    __tablename__ = "table_versions"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<TableVersion {self.name}={self.version}>"
@@ -10,6 +10,10 @@ EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        # orden de los listados y seek del cursor: (created_at desc, id desc)
+        db.Index("ix_users_created_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
@@ -0,0 +1,17 @@
+from sqlalchemy import ForeignKey
+
+from ..extensions import db
+
+
+class UserOrderStats(db.Model):
+    """Resumen de órdenes por usuario, mantenido de forma incremental."""
+
+    __tablename__ = "user_order_stats"
+
+    user_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    last_order_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<UserOrderStats user_id={self.user_id} orders={self.order_count}>"
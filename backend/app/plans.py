@@ -0,0 +1,93 @@
+# app/plans.py
+# Vistas de lectura escritas una sola vez para los dos modos de servir la app.
+# Una vista de lectura es un "plan": un generador que pide cada SELECT con
+# `filas = yield stmt` y devuelve (return) la respuesta, sin tocar la sesión.
+# - WSGI (por defecto): el decorador `view` lo ejecuta con db.session, igual
+#   que una vista Flask común.
+# - ASGI (app/asgi.py): run_async lo ejecuta con el engine async; mientras
+#   espera a la DB el event loop atiende otros requests.
+# Los cuerpos en streaming (export NDJSON/CSV) son planes que además emiten
+# texto: `yield stmt` recibe las filas y `yield "bloque"` lo envía al cliente.
+from functools import wraps
+
+from flask import Response, stream_with_context
+from sqlalchemy.sql import Executable
+
+from .extensions import db
+
+
+def run(plan):
+    """Ejecuta un plan con db.session y devuelve su resultado."""
+    try:
+        stmt = next(plan)
+        while True:
+            stmt = plan.send(db.session.execute(stmt).all())
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_async(plan, conn):
+    """Ejecuta un plan con una AsyncConnection y devuelve su resultado."""
+    try:
+        stmt = next(plan)
+        while True:
+            stmt = plan.send((await conn.execute(stmt)).all())
+    except StopIteration as stop:
+        return stop.value
+
+
+def view(plan_fn):
+    """Vista Flask a partir de un plan; app/asgi.py usa el plan (atributo `plan`)."""
+
+    @wraps(plan_fn)
+    def wrapper(*args, **kwargs):
+        return run(plan_fn(*args, **kwargs))
+
+    wrapper.plan = plan_fn
+    return wrapper
+
+
+def drain(body):
+    """Lo que emite un cuerpo en streaming, leyendo con db.session."""
+    sent = None
+    while True:
+        try:
+            item = body.send(sent)
+        except StopIteration:
+            return
+        if isinstance(item, Executable):
+            sent = db.session.execute(item).all()
+        else:
+            sent = None
+            yield item
+
+
+async def drain_async(body, engine):
+    """Lo que emite un cuerpo en streaming, leyendo con un AsyncEngine.
+
+    Cada SELECT toma una conexión del pool y la devuelve enseguida: mientras
+    un cliente lento recibe los bloques, el stream no retiene conexiones.
+    """
+    sent = None
+    while True:
+        try:
+            item = body.send(sent)
+        except StopIteration:
+            return
+        if isinstance(item, Executable):
+            async with engine.connect() as conn:
+                sent = (await conn.execute(item)).all()
+        else:
+            sent = None
+            yield item
+
+
+def stream(body, **kwargs) -> Response:
+    """Respuesta en streaming cuyo cuerpo es un plan que emite texto.
+
+    En WSGI se recorre con db.session a medida que se envía; app/asgi.py lo
+    recorre con el engine async (atributo `body_plan` de la respuesta).
+    """
+    resp = Response(stream_with_context(drain(body)), **kwargs)
+    resp.body_plan = body
+    return resp
@@ -0,0 +1,111 @@
+# app/query_guard.py
+# Detector de N+1 y consultas lentas para desarrollo y tests (opt-in con
+# QUERY_GUARD_ENABLED; activo por defecto en DevConfig).
+# - Cuenta las sentencias de cada request y lo informa en X-Query-Count.
+# - Agrupa por texto SQL (los parámetros van aparte): si la misma sentencia se
+#   repite QUERY_GUARD_REPEAT_THRESHOLD veces o más en un request, casi
+#   siempre es una consulta por fila dentro de un loop, y se loguea.
+# - Loguea toda sentencia que tarde más de SLOW_QUERY_MS, con su endpoint.
+# Para tests, max_queries() falla si un bloque ejecuta más sentencias que las
+# permitidas:
+#
+#     with max_queries(4):
+#         client.get("/users?include=stats")
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _endpoint() -> str:
+    if has_request_context():
+        return request.endpoint or request.path
+    return "background"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["guard_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("guard_start", None)
+    if start is None or not has_app_context():
+        return  # engine usado fuera de la app
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if has_request_context():
+        statements = g.get("guard_statements")
+        if statements is not None:
+            statements[statement] += 1
+    threshold = current_app.config["SLOW_QUERY_MS"]
+    if threshold and elapsed_ms >= threshold:
+        current_app.logger.warning(
+            "consulta lenta (%.1f ms) en %s: %s",
+            elapsed_ms,
+            _endpoint(),
+            " ".join(statement.split()),
+        )
+
+
+_EVENTS = (
+    ("before_cursor_execute", _before_cursor_execute),
+    ("after_cursor_execute", _after_cursor_execute),
+)
+
+
+def _start_request():
+    g.guard_statements = Counter()
+
+
+def _report(response):
+    statements = g.get("guard_statements")
+    if statements is None:
+        return response
+    response.headers["X-Query-Count"] = str(sum(statements.values()))
+    threshold = current_app.config["QUERY_GUARD_REPEAT_THRESHOLD"]
+    for statement, times in statements.most_common():
+        if times < threshold:
+            break
+        current_app.logger.warning(
+            "posible N+1 en %s: la misma sentencia se ejecutó %d veces: %s",
+            _endpoint(),
+            times,
+            " ".join(statement.split()),
+        )
+    return response
+
+
+def init_app(app):
+    if not app.config["QUERY_GUARD_ENABLED"]:
+        return
+    for name, fn in _EVENTS:
+        if not event.contains(Engine, name, fn):
+            event.listen(Engine, name, fn)
+    app.before_request(_start_request)
+    app.after_request(_report)
+
+
+# -------- Tests --------
+
+
+@contextmanager
+def max_queries(limit: int):
+    """Falla con AssertionError si el bloque ejecuta más de `limit` sentencias SQL.
+
+    Cuenta en todos los engines; entrega la lista de sentencias ejecutadas.
+    """
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(Engine, "after_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(Engine, "after_cursor_execute", record)
+    if len(executed) > limit:
+        detail = "\n".join(f"  {' '.join(s.split())}" for s in executed)
+        raise AssertionError(f"{len(executed)} sentencias SQL (máximo {limit}):\n{detail}")
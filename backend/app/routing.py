@@ -0,0 +1,85 @@
+# app/routing.py
+# Réplica de lectura opcional (DATABASE_READ_URL -> bind "replica").
+# Los GET de los blueprints de lectura (users, orders, io) consultan la
+# réplica; todo lo demás, y cualquier flush o sentencia DML, va al primario.
+# Read-your-writes: después de una escritura exitosa la respuesta indica hasta
+# cuándo (READ_YOUR_WRITES_SECONDS) ese cliente debe leer del primario, para no
+# ver datos viejos mientras la réplica se pone al día. Va en una cookie (mismo
+# origen) y en el header X-Read-Primary-Until (epoch en segundos), que el
+# frontend, de otro origen y sin cookies, reenvía en sus GET hasta que vence.
+import math
+import time
+
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+READ_BLUEPRINTS = ("users", "orders", "io")
+PIN_COOKIE = "db_primary"
+PIN_HEADER = "X-Read-Primary-Until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def reading_from_replica() -> bool:
+    return has_app_context() and g.get("db_replica", False)
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and reading_from_replica()
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def pinned_to_primary() -> bool:
+    if PIN_COOKIE in request.cookies:
+        return True
+    try:
+        return float(request.headers.get(PIN_HEADER, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def has_replica(app) -> bool:
+    return REPLICA_BIND in (app.config.get("SQLALCHEMY_BINDS") or {})
+
+
+def init_app(app):
+    if not has_replica(app):
+        return
+
+    @app.before_request
+    def route_reads():
+        g.db_replica = (
+            request.method in ("GET", "HEAD")
+            and request.blueprint in READ_BLUEPRINTS
+            and not pinned_to_primary()
+        )
+
+    @app.after_request
+    def pin_after_write(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            seconds = app.config["READ_YOUR_WRITES_SECONDS"]
+            response.set_cookie(PIN_COOKIE, "1", max_age=seconds, httponly=True, samesite="Lax")
+            response.headers[PIN_HEADER] = str(math.ceil(time.time() + seconds))
+        return response
+
+
+def sync_sqlite_replica(db):
+    """Copia la DB SQLite primaria sobre la réplica (simula la replicación en local)."""
+    primary, replica = db.engines[None], db.engines[REPLICA_BIND]
+    if primary.dialect.name != "sqlite" or replica.dialect.name != "sqlite":
+        raise ValueError("replica-sync solo copia entre archivos SQLite")
+    src, dst = primary.raw_connection(), replica.raw_connection()
+    try:
+        src.driver_connection.backup(dst.driver_connection)
+    finally:
+        src.close()
+        dst.close()
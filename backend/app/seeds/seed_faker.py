@@ -1,17 +1,23 @@
-from faker import Faker
+import random
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
 from random import randint, uniform
-from decimal import Decimal, ROUND_HALF_UP
-from ..models.user import User
-from ..models.order import Order
+
+from faker import Faker
+from sqlalchemy import func, insert, select, text
+
 from ..extensions import db
+from ..models.order import Order
+from ..models.user import User
+from ..services import order_stats
 
-fake = Faker("es_ES")  # simple y cercano a español
 
 def _money(n: float) -> Decimal:
     # 2 decimales, redondeo contable
     return Decimal(n).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
 def run(users: int = 20, orders: int = 60):
+    fake = Faker("es_ES")  # simple y cercano a español
     Faker.seed(1234)
     # Usuarios
     user_ids = []
@@ -33,3 +39,103 @@ def run(users: int = 20, orders: int = 60):
 
     db.session.commit()
     return {"users": len(user_ids), "orders": orders}
+
+
+# -------- Modo bulk --------
+# Para datasets grandes (pruebas de carga): las filas se generan por bloques de
+# `batch_size` y se insertan con INSERT por lotes (executemany de Core) y un
+# commit por bloque. Los ids se asignan de antemano a partir del máximo actual,
+# así las órdenes referencian usuarios sin esperar a que se inserten (en
+# Postgres, al terminar se avanza la secuencia de cada tabla hasta el id
+# máximo). Sin usuarios nuevos, las órdenes se reparten entre los ids
+# existentes. Cada bloque siembra su propio Faker con (seed, nº de bloque).
+# Generar las filas es ~10% del tiempo; el resto es el INSERT (índices, FTS,
+# triggers, user_order_stats), que en SQLite admite un solo escritor: generar
+# en procesos aparte no acortaba la siembra.
+
+BULK_SPAN = timedelta(days=365)
+BULK_START = datetime(2024, 1, 1)
+
+_bulk_fake = None
+
+
+def _faker(seed: int) -> Faker:
+    global _bulk_fake
+    if _bulk_fake is None:
+        _bulk_fake = Faker("es_ES")
+    _bulk_fake.seed_instance(seed)
+    return _bulk_fake
+
+def _created_at(rnd: random.Random) -> datetime:
+    return BULK_START + timedelta(seconds=rnd.randrange(int(BULK_SPAN.total_seconds())))
+
+def _user_rows(seed: int, batch: int, first_id: int, count: int) -> list[dict]:
+    f = _faker(seed * 1_000_003 + batch)
+    rnd = random.Random(f"{seed}-users-{batch}")
+    rows = []
+    for user_id in range(first_id, first_id + count):
+        # el id en el email lo hace único entre bloques
+        email = f"{f.user_name()}.{user_id}@{f.free_email_domain()}".lower()
+        rows.append({"id": user_id, "name": f.name(), "email": email,
+                     "created_at": _created_at(rnd)})
+    return rows
+
+def _order_rows(seed: int, batch: int, first_id: int, count: int, users) -> list[dict]:
+    f = _faker(seed * 1_000_003 + 500_000 + batch)
+    rnd = random.Random(f"{seed}-orders-{batch}")
+    return [{
+        "id": order_id,
+        "user_id": rnd.choice(users),
+        "product_name": f.catch_phrase()[:120],
+        "amount": _money(rnd.uniform(5, 200)),
+        "created_at": _created_at(rnd),
+    } for order_id in range(first_id, first_id + count)]
+
+def _batches(total: int, batch_size: int, first_id: int):
+    for batch, offset in enumerate(range(0, total, batch_size)):
+        yield batch, first_id + offset, min(batch_size, total - offset)
+
+def _next_id(model) -> int:
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+def _sync_sequence(model):
+    """Postgres: lleva la secuencia del id al máximo insertado (los ids fueron explícitos)."""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return
+    table = model.__table__.name
+    db.session.execute(
+        text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+             f"(SELECT coalesce(max(id), 1) FROM {table}))")
+    )
+    db.session.commit()
+
+def run_bulk(users: int, orders: int, batch_size: int = 10_000, seed: int = 1234,
+             on_batch=None):
+    """Siembra `users` usuarios y `orders` órdenes por bloques. Devuelve los totales."""
+    first_user, first_order = _next_id(User), _next_id(Order)
+    user_ids = range(first_user, first_user + users)
+    if orders and not users:
+        # órdenes para los usuarios existentes (los ids pueden tener huecos)
+        user_ids = db.session.execute(select(User.id).order_by(User.id)).scalars().all()
+        if not user_ids:
+            raise ValueError("No hay usuarios para asignar las órdenes")
+
+    for batch, start, n in _batches(users, batch_size, first_user):
+        rows = _user_rows(seed, batch, start, n)
+        db.session.execute(insert(User.__table__), rows)
+        db.session.commit()
+        if on_batch:
+            on_batch("users", len(rows))
+
+    for batch, start, n in _batches(orders, batch_size, first_order):
+        rows = _order_rows(seed, batch, start, n, user_ids)
+        db.session.execute(insert(Order.__table__), rows)
+        order_stats.add_orders(db.session.connection(), rows)
+        db.session.commit()
+        if on_batch:
+            on_batch("orders", len(rows))
+    if users:
+        _sync_sequence(User)
+    if orders:
+        _sync_sequence(Order)
+    return {"users": users, "orders": orders}
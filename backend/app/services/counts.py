@@ -0,0 +1,43 @@
+# app/services/counts.py
+# Conteos "estimados" para los listados paginados: el COUNT(*) de un filtro se
+# memoiza unos segundos (COUNT_CACHE_TTL) por clave de filtro, así las páginas
+# siguientes de una misma búsqueda no vuelven a contar la tabla. El valor
+# puede estar desfasado como mucho en el TTL; es una memo por proceso.
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import func, select
+
+_lock = threading.Lock()
+_memo = {}  # clave -> (vence, total)
+
+
+def count_select(stmt):
+    """SELECT COUNT(*) de las filas de un SELECT (sin su ORDER BY)."""
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def cached(key) -> int | None:
+    """Total memoizado y vigente para `key`, o None."""
+    with _lock:
+        hit = _memo.get(key)
+    if hit and hit[0] > time.monotonic():
+        return hit[1]
+    return None
+
+
+def store(key, total: int):
+    ttl = current_app.config["COUNT_CACHE_TTL"]
+    with _lock:
+        _memo.pop(key, None)
+        _memo[key] = (time.monotonic() + ttl, total)
+        # acota la memo descartando las entradas más viejas
+        while len(_memo) > current_app.config["COUNT_CACHE_MAX_ENTRIES"]:
+            _memo.pop(next(iter(_memo)))
+
+
+def clear():
+    """Vacía la memo (tests: cada uno usa una DB nueva en el mismo proceso)."""
+    with _lock:
+        _memo.clear()
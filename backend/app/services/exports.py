@@ -0,0 +1,140 @@
+# app/services/exports.py
+# Export por bloques: se recorre cada tabla por id (keyset) en bloques de
+# EXPORT_CHUNK_SIZE filas y se serializa bloque a bloque, así la memoria no
+# depende del tamaño de la tabla. Las filas se leen con SELECT Core y se
+# codifican con los encoders de services/rows.py. Lo usan los endpoints
+# /export/* (streaming NDJSON o CSV) y los jobs de export en segundo plano
+# (archivo JSON o NDJSON). Los recorridos son planes (ver app/plans.py): el
+# mismo código lee con db.session o, servido por ASGI, con el engine async.
+import csv
+import io
+
+from flask import current_app
+
+from ..models.order import Order
+from ..models.user import User
+from ..plans import drain
+from . import rows
+
+# export -> secciones (clave en el JSON, SELECT, columna id, encoder de fila)
+EXPORTS = {
+    "users": [("items", rows.users_select, User.id, rows.encode_user)],
+    "orders": [("items", rows.orders_select, Order.id, rows.encode_order)],
+    "all": [
+        ("users", rows.users_select, User.id, rows.encode_user),
+        ("orders", rows.orders_select, Order.id, rows.encode_order),
+    ],
+}
+# tipo de cada línea de /export/all en NDJSON
+KINDS = {"users": "user", "orders": "order"}
+TYPED_ENCODERS = {
+    "users": rows.compile_encoder(rows.USER_FIELDS, wrap={"type": "user"}),
+    "orders": rows.compile_encoder(rows.ORDER_FIELDS, wrap={"type": "order"}),
+}
+# columnas del export CSV (solo users y orders: /export/all mezcla dos esquemas);
+# son las mismas y en el mismo orden que las del SELECT
+CSV_COLUMNS = {
+    "users": ("id", "name", "email", "created_at"),
+    "orders": ("id", "user_id", "product_name", "amount", "created_at"),
+}
+
+
+def map_chunks(build_select, id_col, fn):
+    """Cuerpo en streaming: recorre la tabla por id ascendente en bloques de
+    EXPORT_CHUNK_SIZE filas y emite fn(bloque) por cada uno."""
+    chunk_size = current_app.config["EXPORT_CHUNK_SIZE"]
+    last_id = 0
+    while True:
+        chunk = yield (
+            build_select().where(id_col > last_id).order_by(id_col.asc()).limit(chunk_size)
+        )
+        if not chunk:
+            return
+        yield fn(chunk)
+        last_id = chunk[-1].id
+
+
+def iter_encoded(build_select, id_col, encode):
+    """Genera listas de filas codificadas como JSON, un bloque por vez."""
+    return drain(map_chunks(build_select, id_col, lambda chunk: [encode(r) for r in chunk]))
+
+
+def ndjson_lines(build_select, id_col, encode):
+    """Cuerpo en streaming: bloques de líneas NDJSON."""
+    return map_chunks(
+        build_select, id_col, lambda chunk: "\n".join([encode(r) for r in chunk]) + "\n"
+    )
+
+
+def csv_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value if isinstance(value, (int, str)) or value is None else float(value)
+
+
+def csv_lines(name: str):
+    """Cuerpo en streaming: encabezado de CSV y luego un bloque por cada bloque de filas."""
+    [(_, build_select, id_col, _)] = EXPORTS[name]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS[name])
+
+    def block(chunk):
+        writer.writerows([csv_value(v) for v in r] for r in chunk)
+        data = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return data
+
+    yield from map_chunks(build_select, id_col, block)
+    if buf.tell():
+        yield buf.getvalue()  # tabla vacía: solo el encabezado
+
+
+def ndjson_sources(name: str):
+    sections = EXPORTS[name]
+    if len(sections) == 1:
+        _, build_select, id_col, encode = sections[0]
+        return [(build_select, id_col, encode)]
+    return [
+        (build_select, id_col, TYPED_ENCODERS[key]) for key, build_select, id_col, _ in sections
+    ]
+
+
+def json_body(name: str):
+    """Plan: export completo en memoria con la forma {clave: [...]} (respuesta JSON)."""
+    body = {}
+    for key, build_select, id_col, encode in EXPORTS[name]:
+        body[key] = rows.encode_rows(encode, (yield build_select().order_by(id_col.asc())))
+    return body
+
+
+def write_ndjson(fp, name: str, on_chunk=None):
+    """Escribe el export `name` como NDJSON en `fp`. Devuelve la cantidad de filas."""
+    written = 0
+    for source in ndjson_sources(name):
+        for block in drain(ndjson_lines(*source)):
+            fp.write(block)
+            written += block.count("\n")
+            if on_chunk:
+                on_chunk(written)
+    return written
+
+
+def write_json(fp, name: str, on_chunk=None):
+    """Escribe el export `name` con la misma forma que la respuesta JSON, por bloques."""
+    dumps = current_app.json.dumps
+    written = 0
+    fp.write("{")
+    for i, (key, build_select, id_col, encode) in enumerate(EXPORTS[name]):
+        fp.write(("," if i else "") + dumps(key) + ":[")
+        first = True
+        for encoded in iter_encoded(build_select, id_col, encode):
+            fp.write(("" if first else ",") + ",".join(encoded))
+            first = False
+            written += len(encoded)
+            if on_chunk:
+                on_chunk(written)
+        fp.write("]")
+    fp.write("}\n")
+    return written
@@ -0,0 +1,132 @@
+# app/services/idempotency.py
+# Reintentos seguros para los POST de creación (header Idempotency-Key).
+# La clave se reserva con un INSERT en la misma transacción que la escritura
+# del endpoint: si el request falla antes del commit no queda nada y se puede
+# reintentar; si llega al commit, la clave queda tomada y luego se completa con
+# la respuesta (si la vista hizo rollback y respondió < 500, p. ej. el 422 de
+# una FK inexistente, la clave se vuelve a tomar junto con esa respuesta). Un
+# reintento con la misma clave y el mismo request recibe la respuesta guardada
+# (sin volver a escribir); con otro request, 422; mientras el original sigue
+# en curso, 409. Las claves vencen a las IDEMPOTENCY_KEY_TTL
+# horas (se purgan con `flask idempotency-purge`).
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import Response, current_app, make_response, request
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from ..errors import make_error
+from ..extensions import db
+from ..models.idempotency_key import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+keys = IdempotencyKey.__table__
+
+
+def _fingerprint() -> str:
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def _cutoff() -> datetime:
+    ttl = timedelta(hours=current_app.config["IDEMPOTENCY_KEY_TTL"])
+    return datetime.now(timezone.utc).replace(tzinfo=None) - ttl
+
+
+def _replay(found: IdempotencyKey) -> Response:
+    resp = Response(found.response_body, status=found.status_code, mimetype="application/json")
+    resp.headers[REPLAY_HEADER] = "true"
+    return resp
+
+
+def _release(key: str):
+    """Libera una clave sin respuesta (el request falló después de su commit)."""
+    db.session.rollback()
+    db.session.execute(delete(keys).where(keys.c.key == key, keys.c.status_code.is_(None)))
+    db.session.commit()
+
+
+def idempotent(view):
+    """Aplica Idempotency-Key a un POST que hace (a lo sumo) un commit con su escritura."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return make_error(
+                400,
+                "invalid_idempotency_key",
+                f"{HEADER} debe tener entre 1 y {MAX_KEY_LENGTH} caracteres",
+            )
+
+        fingerprint = _fingerprint()
+        found = db.session.get(IdempotencyKey, key)
+        if found is not None and found.created_at < _cutoff():
+            db.session.delete(found)
+            db.session.flush()
+            found = None
+        if found is not None:
+            if found.request_hash != fingerprint:
+                return make_error(
+                    422,
+                    "idempotency_key_reused",
+                    f"{HEADER} ya se usó con otro request",
+                )
+            if found.status_code is None:
+                return make_error(
+                    409,
+                    "idempotency_key_in_progress",
+                    f"El request con este {HEADER} todavía está en curso",
+                )
+            return _replay(found)
+
+        try:
+            db.session.execute(insert(keys).values(key=key, request_hash=fingerprint))
+        except IntegrityError:
+            # otro request tomó la clave entre la consulta y el INSERT
+            db.session.rollback()
+            return make_error(
+                409,
+                "idempotency_key_in_progress",
+                f"El request con este {HEADER} todavía está en curso",
+            )
+
+        try:
+            resp = make_response(view(*args, **kwargs))
+        except Exception:
+            _release(key)
+            raise
+        if resp.status_code >= 500 or resp.is_streamed:
+            _release(key)
+            return resp
+
+        values = {"status_code": resp.status_code, "response_body": resp.get_data(as_text=True)}
+        stored = db.session.execute(update(keys).where(keys.c.key == key).values(**values))
+        if stored.rowcount == 0:
+            # la vista hizo rollback (p. ej. 422 por FK) y se llevó la reserva:
+            # se vuelve a tomar la clave con la respuesta, así el reintento la repite
+            try:
+                db.session.execute(insert(keys).values(key=key, request_hash=fingerprint, **values))
+            except IntegrityError:
+                db.session.rollback()  # la tomó un reintento concurrente
+                return resp
+        db.session.commit()
+        return resp
+
+    return wrapper
+
+
+def purge() -> int:
+    """Borra las claves vencidas; devuelve cuántas."""
+    result = db.session.execute(delete(keys).where(keys.c.created_at < _cutoff()))
+    db.session.commit()
+    return result.rowcount
@@ -0,0 +1,158 @@
+# app/services/imports.py
+# Motor de importación por conjuntos: en lugar de una consulta y un objeto ORM
+# por fila, procesa los items en bloques de IMPORT_CHUNK_SIZE; cada bloque
+# resuelve duplicados con consultas IN (...), inserta con un INSERT multi-fila
+# y hace commit propio.
+import math
+import time
+from itertools import islice
+
+from flask import current_app
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..extensions import db
+from ..models.order import Order
+from ..models.user import EMAIL_RE, User
+from . import order_stats
+
+# Máximo de parámetros por consulta IN (...) (holgado para SQLite y Postgres)
+LOOKUP_CHUNK = 500
+
+
+def batched(iterable, size: int):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def insert_ignoring(table, conflict_cols):
+    """INSERT que ignora conflictos de unicidad cuando el dialecto lo soporta."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing(index_elements=conflict_cols)
+    if dialect == "postgresql":
+        return pg_insert(table).on_conflict_do_nothing(index_elements=conflict_cols)
+    return insert(table)
+
+
+def existing_emails(emails) -> set:
+    found = set()
+    for part in batched(emails, LOOKUP_CHUNK):
+        found.update(db.session.scalars(select(User.email).where(User.email.in_(part))))
+    return found
+
+
+def existing_user_ids(ids) -> set:
+    found = set()
+    for part in batched(ids, LOOKUP_CHUNK):
+        found.update(db.session.scalars(select(User.id).where(User.id.in_(part))))
+    return found
+
+
+def import_users(items, chunk_size: int | None = None, on_chunk=None) -> dict:
+    """Importa usuarios; saltea inválidos y emails repetidos (en el payload o en la DB).
+
+    Devuelve {created, skipped, chunks}, con la duración (ms) de cada bloque.
+    `on_chunk(created, skipped)` se llama tras el commit de cada bloque.
+    """
+    chunk_size = chunk_size or current_app.config["IMPORT_CHUNK_SIZE"]
+    created, skipped, timings = 0, 0, []
+
+    for chunk in batched(items, chunk_size):
+        started = time.perf_counter()
+        rows = {}  # email -> name; dedupe dentro del bloque
+        for it in chunk:
+            if not isinstance(it, dict):
+                skipped += 1
+                continue
+            name = (it.get("name") or "").strip()
+            email = (it.get("email") or "").strip().lower()
+            if not name or not EMAIL_RE.fullmatch(email) or email in rows:
+                skipped += 1
+                continue
+            rows[email] = name
+
+        # los bloques anteriores ya están commiteados: esta consulta también
+        # detecta repetidos entre bloques
+        taken = existing_emails(rows)
+        new = [{"name": name, "email": email} for email, name in rows.items() if email not in taken]
+        inserted = 0
+        if new:
+            result = db.session.execute(insert_ignoring(User.__table__, ["email"]), new)
+            inserted = result.rowcount if result.rowcount >= 0 else len(new)
+        db.session.commit()
+
+        created += inserted
+        skipped += len(rows) - inserted
+        timings.append(round((time.perf_counter() - started) * 1000, 2))
+        current_app.logger.info(
+            "import users chunk %d: %d filas, %d creadas, %.2f ms",
+            len(timings),
+            len(chunk),
+            inserted,
+            timings[-1],
+        )
+        if on_chunk:
+            on_chunk(created, skipped)
+
+    return {"created": created, "skipped": skipped, "chunks": timings}
+
+
+def parse_order(it) -> dict | None:
+    try:
+        user_id = int(it.get("user_id"))
+        product_name = (it.get("product_name") or "").strip()
+        amount = float(it.get("amount"))
+    except Exception:
+        return None
+    if not product_name or not math.isfinite(amount) or amount <= 0:
+        return None
+    return {"user_id": user_id, "product_name": product_name, "amount": amount}
+
+
+def import_orders(items, chunk_size: int | None = None, on_chunk=None) -> dict:
+    """Importa órdenes; saltea inválidas o con user_id inexistente.
+
+    Los user_id se resuelven por conjuntos (IN) y se recuerdan entre bloques,
+    así cada usuario se consulta una sola vez por import.
+    """
+    chunk_size = chunk_size or current_app.config["IMPORT_CHUNK_SIZE"]
+    created, skipped, timings = 0, 0, []
+    known, missing = set(), set()
+
+    for chunk in batched(items, chunk_size):
+        started = time.perf_counter()
+        rows = [parse_order(it) if isinstance(it, dict) else None for it in chunk]
+        rows = [r for r in rows if r is not None]
+        skipped += len(chunk) - len(rows)
+
+        pending = {r["user_id"] for r in rows} - known - missing
+        if pending:
+            found = existing_user_ids(pending)
+            known |= found
+            missing |= pending - found
+        new = [r for r in rows if r["user_id"] in known]
+        if new:
+            # RETURNING: el resumen usa el created_at que asignó la DB
+            inserted = db.session.execute(
+                insert(Order).returning(Order.user_id, Order.amount, Order.created_at), new
+            )
+            order_stats.add_orders(db.session.connection(), inserted.mappings().all())
+        db.session.commit()
+
+        created += len(new)
+        skipped += len(rows) - len(new)
+        timings.append(round((time.perf_counter() - started) * 1000, 2))
+        current_app.logger.info(
+            "import orders chunk %d: %d filas, %d creadas, %.2f ms",
+            len(timings),
+            len(chunk),
+            len(new),
+            timings[-1],
+        )
+        if on_chunk:
+            on_chunk(created, skipped)
+
+    return {"created": created, "skipped": skipped, "chunks": timings}
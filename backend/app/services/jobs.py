@@ -0,0 +1,242 @@
+# app/services/jobs.py
+# Jobs en segundo plano para imports/exports grandes: el request solo guarda
+# la entrada (import) en JOBS_DIR, registra el job en la tabla `jobs` y
+# devuelve 202; un pool de hilos del proceso (JOBS_MAX_WORKERS) lo ejecuta con
+# su propio app context y va actualizando los contadores de progreso.
+# El estado vive en la DB, así cualquier worker puede responder GET /jobs/<id>.
+# Un job queued/running cuyo proceso murió no avanza más: al arrancar el pool de
+# cada proceso (y con `flask jobs-cleanup`) se marcan como failed los que llevan
+# JOBS_STALE_MINUTES sin progreso, y se borran los jobs terminados y los
+# archivos de JOBS_DIR con más de JOBS_RESULT_TTL horas.
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, func, select, update
+
+from ..extensions import db
+from ..models.job import Job
+from . import exports, imports, readers
+
+IMPORTERS = {"users": imports.import_users, "orders": imports.import_orders}
+EXPORT_MIMETYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+ACTIVE = ("queued", "running")
+FINISHED = ("succeeded", "failed")
+JOB_FILES = {"input", *EXPORT_MIMETYPES}  # extensiones de los archivos en JOBS_DIR
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def _get_executor(app) -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    with _lock:
+        # los hilos no sobreviven a un fork: cada proceso crea su propio pool
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config["JOBS_MAX_WORKERS"], thread_name_prefix="job"
+            )
+            _executor_pid = os.getpid()
+            # arranque del pool: jobs de procesos caídos y archivos vencidos
+            _executor.submit(_cleanup, app)
+        return _executor
+
+
+def jobs_dir() -> str:
+    path = current_app.config["JOBS_DIR"] or os.path.join(current_app.instance_path, "jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# -------- Alta --------
+
+
+def create_import(target: str, stream, mimetype: str, gzipped: bool) -> Job:
+    """Guarda el body en disco (sin cargarlo en memoria) y encola el import."""
+    job_id = uuid.uuid4().hex
+    path = os.path.join(jobs_dir(), f"{job_id}.input")
+    with open(path, "wb") as fp:
+        shutil.copyfileobj(stream, fp, 1024 * 1024)
+    params = {"input": path, "mimetype": mimetype, "gzipped": gzipped}
+    return _submit(Job(id=job_id, kind=f"import_{target}", params=params))
+
+
+def create_export(target: str, fmt: str) -> Job:
+    job = Job(id=uuid.uuid4().hex, kind=f"export_{target}", params={"format": fmt})
+    return _submit(job)
+
+
+def _submit(job: Job) -> Job:
+    db.session.add(job)
+    db.session.commit()
+    app = current_app._get_current_object()
+    if app.config["JOBS_EAGER"]:
+        _run(app, job.id)
+        db.session.refresh(job)
+    else:
+        _get_executor(app).submit(_run, app, job.id)
+    return job
+
+
+# -------- Ejecución --------
+
+
+def _progress(job_id: str, **counters):
+    # UPDATE directo: no depende del estado del Job en la Session
+    db.session.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(**counters, updated_at=_now())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def _run(app, job_id: str):
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        kind, target = job.kind.split("_", 1)
+        params = dict(job.params)
+        # solo si sigue en cola: pudo quedar marcado como failed por reap_stale
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "queued")
+            .values(status="running", started_at=_now(), updated_at=_now())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if claimed.rowcount != 1:
+            return
+        try:
+            if kind == "import":
+                result = _run_import(job_id, target, params)
+            else:
+                result = _run_export(job_id, target, params)
+            _progress(job_id, status="succeeded", result=result, finished_at=_now())
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception("job %s (%s) falló", job_id, kind)
+            message = str(e) if isinstance(e, readers.ReaderError) else "Error interno del job"
+            _progress(job_id, status="failed", error=message, finished_at=_now())
+        finally:
+            if kind == "import":
+                _remove(params["input"])
+
+
+def _run_import(job_id: str, target: str, params: dict) -> dict:
+    def on_chunk(created, skipped):
+        _progress(job_id, processed=created + skipped, created=created, skipped=skipped)
+
+    with open(params["input"], "rb") as fp:
+        items = readers.iter_items(fp, params["mimetype"], gzipped=params["gzipped"])
+        res = IMPORTERS[target](items, on_chunk=on_chunk)
+    return {"created": res["created"], "skipped": res["skipped"]}
+
+
+def _run_export(job_id: str, target: str, params: dict) -> dict:
+    fmt = params["format"]
+    path = os.path.join(jobs_dir(), f"{job_id}.{fmt}")
+    write = exports.write_ndjson if fmt == "ndjson" else exports.write_json
+    with open(path, "w", encoding="utf-8") as fp:
+        rows = write(fp, target, on_chunk=lambda n: _progress(job_id, processed=n))
+    return {"path": path, "mimetype": EXPORT_MIMETYPES[fmt], "rows": rows}
+
+
+# -------- Limpieza --------
+
+
+def reap_stale() -> int:
+    """Marca como failed los jobs queued/running sin progreso; devuelve cuántos."""
+    cutoff = _now() - timedelta(minutes=current_app.config["JOBS_STALE_MINUTES"])
+    stmt = (
+        update(Job)
+        .where(Job.status.in_(ACTIVE), func.coalesce(Job.updated_at, Job.created_at) < cutoff)
+        .values(status="failed", error="Job interrumpido sin terminar", finished_at=_now())
+        .returning(Job.params)
+        .execution_options(synchronize_session=False)
+    )
+    reaped = db.session.execute(stmt).scalars().all()
+    db.session.commit()
+    for params in reaped:
+        if params.get("input"):
+            _remove(params["input"])
+    return len(reaped)
+
+
+def purge_expired() -> dict:
+    """Borra los jobs terminados y los archivos de JOBS_DIR más viejos que JOBS_RESULT_TTL."""
+    cutoff = _now() - timedelta(hours=current_app.config["JOBS_RESULT_TTL"])
+    jobs = db.session.execute(
+        delete(Job).where(Job.status.in_(FINISHED), Job.finished_at < cutoff)
+    ).rowcount
+    db.session.commit()
+    # archivos de jobs borrados o huérfanos; nunca los de un job en curso
+    active = set(db.session.execute(select(Job.id).where(Job.status.in_(ACTIVE))).scalars())
+    files = 0
+    oldest = cutoff.replace(tzinfo=timezone.utc).timestamp()
+    with os.scandir(jobs_dir()) as entries:
+        for entry in entries:
+            job_id, _, ext = entry.name.partition(".")
+            if (
+                ext in JOB_FILES
+                and job_id not in active
+                and entry.is_file()
+                and entry.stat().st_mtime < oldest
+            ):
+                files += _remove(entry.path)
+    return {"jobs": jobs, "files": files}
+
+
+def cleanup() -> dict:
+    return {"reaped": reap_stale(), **purge_expired()}
+
+
+def _cleanup(app):
+    with app.app_context():
+        try:
+            app.logger.info("limpieza de jobs: %s", cleanup())
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("limpieza de jobs falló")
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
+
+
+# -------- Lectura --------
+
+
+def serialize_job(job: Job) -> dict:
+    def iso(dt):
+        return dt.isoformat() if dt else None
+
+    data = {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "processed": job.processed,
+        "created": job.created,
+        "skipped": job.skipped,
+        "error": job.error,
+        "created_at": iso(job.created_at),
+        "started_at": iso(job.started_at),
+        "updated_at": iso(job.updated_at),
+        "finished_at": iso(job.finished_at),
+    }
+    if job.kind.startswith("export_") and job.result:
+        data["rows"] = job.result.get("rows")
+    return data
@@ -0,0 +1,135 @@
+# app/services/order_stats.py
+# Resumen materializado de órdenes por usuario (user_order_stats): cantidad,
+# total gastado y fecha de la última orden. Se actualiza en la misma
+# transacción que la escritura de órdenes, así leerlo cuesta O(1) por usuario:
+# - órdenes ORM nuevas/modificadas/borradas: evento after_flush de la Session;
+# - inserts Core (import, batch): llamada explícita a add_orders() con las filas
+#   que devuelve RETURNING (created_at es el de la DB, no la hora de la app).
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.order import Order
+from ..models.user_order_stats import UserOrderStats
+
+stats = UserOrderStats.__table__
+
+UPSERTS = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+
+def _deltas(rows) -> list[dict]:
+    acc = defaultdict(lambda: [0, Decimal("0"), None])
+    for row in rows:
+        entry = acc[row["user_id"]]
+        entry[0] += 1
+        entry[1] += Decimal(str(row["amount"]))
+        if entry[2] is None or row["created_at"] > entry[2]:
+            entry[2] = row["created_at"]
+    return [
+        {"user_id": user_id, "order_count": count, "total_amount": total, "last_order_at": last}
+        for user_id, (count, total, last) in acc.items()
+    ]
+
+
+def add_orders(conn, rows):
+    """Suma `rows` a los resúmenes, en la transacción de `conn`.
+
+    Cada fila es un mapping con user_id, amount y created_at (el de RETURNING
+    o el explícito del seed); last_order_at es el mayor created_at por usuario.
+    """
+    deltas = _deltas(rows)
+    if not deltas:
+        return
+    upsert = UPSERTS.get(conn.dialect.name)
+    if upsert is None:
+        for d in deltas:
+            last = d["last_order_at"]
+            result = conn.execute(
+                update(stats)
+                .where(stats.c.user_id == d["user_id"])
+                .values(
+                    order_count=stats.c.order_count + d["order_count"],
+                    total_amount=stats.c.total_amount + d["total_amount"],
+                    last_order_at=case(
+                        (stats.c.last_order_at.is_(None), last),
+                        (stats.c.last_order_at < last, last),
+                        else_=stats.c.last_order_at,
+                    ),
+                )
+            )
+            if result.rowcount == 0:
+                conn.execute(insert(stats).values(**d))
+        return
+
+    stmt = upsert(stats)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "order_count": stats.c.order_count + excluded.order_count,
+            "total_amount": stats.c.total_amount + excluded.total_amount,
+            "last_order_at": case(
+                (stats.c.last_order_at.is_(None), excluded.last_order_at),
+                (excluded.last_order_at > stats.c.last_order_at, excluded.last_order_at),
+                else_=stats.c.last_order_at,
+            ),
+        },
+    )
+    conn.execute(stmt, deltas)
+
+
+def refresh(conn, user_ids):
+    """Recalcula desde orders el resumen de `user_ids` (p. ej. tras borrar órdenes)."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    conn.execute(delete(stats).where(stats.c.user_id.in_(user_ids)))
+    conn.execute(
+        insert(stats).from_select(
+            ["user_id", "order_count", "total_amount", "last_order_at"],
+            select(Order.user_id, func.count(), func.sum(Order.amount), func.max(Order.created_at))
+            .where(Order.user_id.in_(user_ids))
+            .group_by(Order.user_id),
+        )
+    )
+
+
+def _after_flush(session, flush_context):
+    new = [o for o in session.new if isinstance(o, Order)]
+    changed = {o.user_id for o in session.deleted if isinstance(o, Order)}
+    for o in session.dirty:
+        if isinstance(o, Order) and session.is_modified(o):
+            changed.add(o.user_id)
+            # si la orden cambió de usuario, también el anterior
+            changed.update(inspect(o).attrs.user_id.history.deleted)
+    if new or changed:
+        conn = session.connection()
+        # created_at ya cargado: Order usa eager_defaults (RETURNING en el INSERT)
+        add_orders(
+            conn,
+            [{"user_id": o.user_id, "amount": o.amount, "created_at": o.created_at} for o in new],
+        )
+        refresh(conn, changed)
+
+
+def init_app(app):
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+
+
+# -------- Lectura --------
+
+
+def summary(count, total, last_order_at) -> dict:
+    count = count or 0
+    total = Decimal(total or 0)
+    return {
+        "order_count": count,
+        "total_spent": float(total),
+        "avg_ticket": float(round(total / count, 2)) if count else None,
+        "last_order_at": last_order_at.isoformat() if last_order_at else None,
+    }
@@ -0,0 +1,62 @@
+# app/services/readers.py
+# Lectores incrementales para los import: en vez de bufferear el body entero
+# y parsearlo a una lista, leen del stream de a una línea/fila y entregan los
+# items de a uno. Combinados con el motor por bloques (imports.py) la memoria
+# queda acotada por IMPORT_CHUNK_SIZE y no por el tamaño del upload.
+import csv
+import gzip
+import io
+import json
+import zlib
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+CSV_MIMETYPE = "text/csv"
+STREAM_MIMETYPES = (*NDJSON_MIMETYPES, CSV_MIMETYPE)
+
+
+class ReaderError(ValueError):
+    """El body no se puede leer (gzip corrupto, encoding o JSON inválidos)."""
+
+
+def iter_ndjson(text):
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None  # línea inválida: el import la cuenta como skipped
+
+
+def iter_csv(text):
+    yield from csv.DictReader(text)
+
+
+def iter_json(binary):
+    try:
+        data = json.load(binary)
+    except ValueError as e:
+        raise ReaderError("JSON inválido") from e
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ReaderError("Se esperaba { items: [] }")
+    yield from items
+
+
+def iter_items(stream, mimetype: str, gzipped: bool = False):
+    """Itera los items de un body NDJSON, CSV o JSON, opcionalmente con gzip."""
+    binary = gzip.GzipFile(fileobj=stream, mode="rb") if gzipped else stream
+    try:
+        if mimetype in NDJSON_MIMETYPES or mimetype == CSV_MIMETYPE:
+            # utf-8-sig tolera el BOM que agregan algunas planillas al exportar CSV
+            text = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+            yield from iter_csv(text) if mimetype == CSV_MIMETYPE else iter_ndjson(text)
+        else:
+            yield from iter_json(binary)
+    except (OSError, EOFError, zlib.error) as e:
+        raise ReaderError("Body gzip inválido o truncado") from e
+    except UnicodeDecodeError as e:
+        raise ReaderError("El body debe estar en UTF-8") from e
+    except csv.Error as e:
+        raise ReaderError(f"CSV inválido: {e}") from e
@@ -0,0 +1,146 @@
+# app/services/rows.py
+# Lecturas sin hidratar entidades ORM: los listados y exports seleccionan solo
+# las columnas que devuelven (SELECT Core) y cada fila se codifica a JSON con
+# un encoder generado una vez por forma de respuesta, en lugar de armar un dict
+# por fila (isoformat, Decimal -> float...) y pasarlo entero por json.dumps.
+#
+# La salida es idéntica byte a byte a la de jsonify en modo compacto: claves
+# ordenadas, sin espacios y con escapes ASCII. Los bloques codificados viajan
+# como RawJSON y el JSON provider de la app los inserta sin volver a procesarlos.
+#
+# Los builders de consultas (*_select) no dependen de la Session, así cualquier
+# otro camino de lectura puede ejecutarlos con su propia conexión.
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii as _esc
+from operator import itemgetter
+
+from sqlalchemy import select
+
+from ..json_provider import RawJSON
+from ..models.order import Order
+from ..models.user import User
+from ..models.user_order_stats import UserOrderStats
+
+
+def _float(value) -> str:
+    return float.__repr__(float(value))
+
+
+def _avg(count, total) -> str:
+    # mismo redondeo que order_stats.summary
+    return _float(round(Decimal(total) / count, 2)) if count else "null"
+
+
+# tipo -> expresión Python que produce el texto JSON del valor ({} = r[i])
+_KINDS = {
+    "int": "str({})",
+    "int0": "str({} or 0)",
+    "str": "_esc({})",
+    "float": "_float({})",
+    "float0": "_float({} or 0)",
+    # Decimal como string ("3.50"), como lo serializa el provider por defecto
+    "decimal": "_esc(str({}))",
+    "datetime": "'\"' + {}.isoformat() + '\"'",
+    "avg": "_avg({}, {})",
+}
+
+
+def _value(index, kind) -> str:
+    if isinstance(kind, tuple):
+        # objeto anidado; null si la columna `index` es NULL (p. ej. outer join)
+        return f"('null' if r[{index}] is None else {_object(kind)})"
+    if kind.endswith("?"):
+        return f"('null' if r[{index}] is None else {_value(index, kind[:-1])})"
+    indexes = index if isinstance(index, tuple) else (index,)
+    return _KINDS[kind].format(*(f"r[{i}]" for i in indexes))
+
+
+def _object(fields) -> str:
+    parts = []
+    for n, (key, index, kind) in enumerate(sorted(fields, key=itemgetter(0))):
+        parts.append(repr(("," if n else "{") + _esc(key) + ":"))
+        parts.append(_value(index, kind))
+    parts.append("'}'")
+    return "''.join((" + ", ".join(parts) + "))"
+
+
+def compile_encoder(fields, wrap=None):
+    """Genera una función fila -> texto JSON.
+
+    `fields` es una secuencia de (clave, índice en la fila, tipo); el tipo puede
+    ser una de _KINDS (con "?" si admite NULL) o una tupla de fields para un
+    objeto anidado. Con `wrap` = {"clave": "valor"} el objeto va envuelto como
+    {"data": <fila>, "clave": "valor"} (línea tipada de /export/all).
+    """
+    body = _object(fields)
+    if wrap:
+        ((key, value),) = wrap.items()
+        suffix = "," + _esc(key) + ":" + _esc(value) + "}"
+        body = f"'{{\"data\":' + {body} + {suffix!r}"
+    ns = {"_esc": _esc, "_float": _float, "_avg": _avg}
+    exec(f"def encode(r):\n    return {body}\n", ns)
+    return ns["encode"]
+
+
+def encode_rows(encode, rows) -> RawJSON:
+    """Array JSON con las filas codificadas, listo para incluir en una respuesta."""
+    return RawJSON("[" + ",".join(map(encode, rows)) + "]")
+
+
+# -------- Formas de respuesta --------
+
+USER_COLUMNS = (User.id, User.name, User.email, User.created_at)
+USER_FIELDS = (
+    ("id", 0, "int"),
+    ("name", 1, "str"),
+    ("email", 2, "str"),
+    ("created_at", 3, "datetime"),
+)
+# ?include=stats: columnas 4-6 de user_order_stats (outer join)
+USER_STATS_FIELDS = USER_FIELDS + (
+    ("order_count", 4, "int0"),
+    ("total_spent", 5, "float0"),
+    ("avg_ticket", (4, 5), "avg"),
+    ("last_order_at", 6, "datetime?"),
+)
+
+ORDER_COLUMNS = (Order.id, Order.user_id, Order.product_name, Order.amount, Order.created_at)
+ORDER_FIELDS = (
+    ("id", 0, "int"),
+    ("user_id", 1, "int"),
+    ("product_name", 2, "str"),
+    ("amount", 3, "float"),
+    ("created_at", 4, "datetime"),
+)
+# GET /orders: columnas 5-7 del usuario (outer join)
+ORDER_USER_FIELDS = ORDER_FIELDS + (
+    ("user", 5, (("id", 5, "int"), ("name", 6, "str"), ("email", 7, "str"))),
+)
+# GET /users/<id>/orders siempre devolvió amount como string
+USER_ORDER_FIELDS = ORDER_FIELDS[:3] + (("amount", 3, "decimal"),) + ORDER_FIELDS[4:]
+
+encode_user = compile_encoder(USER_FIELDS)
+encode_user_stats = compile_encoder(USER_STATS_FIELDS)
+encode_order = compile_encoder(ORDER_FIELDS)
+encode_order_user = compile_encoder(ORDER_USER_FIELDS)
+encode_user_order = compile_encoder(USER_ORDER_FIELDS)
+
+
+def users_select(with_stats: bool = False):
+    stmt = select(*USER_COLUMNS)
+    if with_stats:
+        stmt = stmt.add_columns(
+            UserOrderStats.order_count, UserOrderStats.total_amount, UserOrderStats.last_order_at
+        ).outerjoin(UserOrderStats, UserOrderStats.user_id == User.id)
+    return stmt
+
+
+def orders_select(with_user: bool = False):
+    stmt = select(*ORDER_COLUMNS)
+    if with_user:
+        stmt = stmt.add_columns(
+            User.id.label("user__id"),
+            User.name.label("user__name"),
+            User.email.label("user__email"),
+        ).outerjoin(User, User.id == Order.user_id)
+    return stmt
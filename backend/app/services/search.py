@@ -0,0 +1,70 @@
+# app/services/search.py
+# Búsqueda ?q= sobre un índice de texto en lugar de ILIKE '%q%' (que no puede
+# usar índices y recorre la tabla entera).
+# - SQLite: tablas FTS5 con tokenizer trigram (<tabla>_fts), sincronizadas por
+#   triggers creados en la migración. El trigram resuelve búsquedas por
+#   subcadena, igual que el ILIKE que reemplaza.
+# - Postgres: la migración crea índices GIN pg_trgm, que el mismo ILIKE usa.
+# Si el índice FTS no existe (p. ej. DB creada con create_all) se usa ILIKE.
+# Su presencia se vuelve a consultar cada SEARCH_FTS_CHECK_TTL segundos: un
+# worker que arrancó antes de `flask db upgrade` (o de un downgrade) se entera
+# sin reiniciarse. La consulta es un paso del plan de la vista (ver
+# app/plans.py), así en modo ASGI corre en la conexión async y no bloquea el
+# event loop.
+import time
+
+from flask import current_app
+from sqlalchemy import column, or_, select, table, text
+
+from ..extensions import db
+
+SEARCH_COLUMNS = {
+    "users": ("name", "email"),
+    "orders": ("product_name",),
+}
+
+# el trigram necesita al menos 3 caracteres; con menos, ILIKE
+FTS_MIN_LENGTH = 3
+
+_fts_available = {}  # (url, tabla) -> (vence, existe)
+
+
+def fts_table(tablename: str) -> str:
+    return f"{tablename}_fts"
+
+
+def has_fts(tablename: str):
+    """Paso de plan: True si existe el índice FTS de `tablename`."""
+    bind = db.session.get_bind()  # solo elige el engine, no conecta
+    if bind.dialect.name != "sqlite":
+        return False
+    key = (str(bind.url), tablename)
+    hit = _fts_available.get(key)
+    if hit is None or hit[0] <= time.monotonic():
+        found = yield text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ).bindparams(name=fts_table(tablename))
+        ttl = current_app.config["SEARCH_FTS_CHECK_TTL"]
+        hit = _fts_available[key] = (time.monotonic() + ttl, bool(found))
+    return hit[1]
+
+
+def fts_match(q: str) -> str:
+    # frase entre comillas: FTS5 no interpreta operadores dentro del texto
+    return '"' + q.replace('"', '""') + '"'
+
+
+def text_filter(model, q: str):
+    """Paso de plan: condición para filtrar `model` por `q` en sus columnas de búsqueda."""
+    tablename = model.__tablename__
+    if len(q) >= FTS_MIN_LENGTH and (yield from has_fts(tablename)):
+        fts = fts_table(tablename)
+        matches = (
+            select(column("rowid"))
+            .select_from(table(fts))
+            .where(text(f"{fts} MATCH :fts_q").bindparams(fts_q=fts_match(q)))
+        )
+        return model.id.in_(matches)
+
+    like = f"%{q}%"
+    return or_(*(getattr(model, name).ilike(like) for name in SEARCH_COLUMNS[tablename]))
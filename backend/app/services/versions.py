@@ -0,0 +1,155 @@
+# app/services/versions.py
+# Versiones de escritura por tabla para respuestas condicionales.
+# Cada commit que escribió en users/orders incrementa su fila en
+# table_versions dentro de la misma transacción (eventos de Session), así el
+# validador es correcto entre varios workers. Con esas versiones se arma un
+# ETag fuerte y un Last-Modified; si el cliente ya tiene la representación se
+# responde 304 sin ejecutar la consulta principal ni serializar nada.
+#
+# Las escrituras por SQL crudo (text()) no se detectan: deben llamar a bump().
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from ..compression import GZIP_ETAG_SUFFIX
+from ..models.table_version import TableVersion
+from .imports import insert_ignoring
+
+TRACKED_TABLES = ("users", "orders")
+# borrar un usuario borra sus órdenes por ON DELETE CASCADE en la DB
+DELETE_CASCADES = {"users": ("orders",)}
+
+
+def _pending(session) -> set:
+    return session.info.setdefault("written_tables", set())
+
+
+def _track(session, tablename: str, deleted: bool = False):
+    if tablename in TRACKED_TABLES:
+        _pending(session).add(tablename)
+        if deleted:
+            _pending(session).update(DELETE_CASCADES.get(tablename, ()))
+
+
+def _after_flush(session, flush_context):
+    for obj in session.new | session.dirty:
+        _track(session, obj.__table__.name)
+    for obj in session.deleted:
+        _track(session, obj.__table__.name, deleted=True)
+
+
+def _do_orm_execute(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        _track(state.session, state.statement.table.name, deleted=state.is_delete)
+
+
+def _before_commit(session):
+    session.flush()
+    tables = _pending(session)
+    if tables:
+        bump(session, *sorted(tables))
+        tables.clear()
+
+
+def _discard(session, *args):
+    _pending(session).clear()
+
+
+def bump(session, *tables):
+    """Incrementa la versión de `tables` en la transacción actual de `session`."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    result = session.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(tables))
+        .values(version=TableVersion.version + 1, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount < len(tables):
+        # DB creada sin la migración: crea las filas faltantes
+        session.execute(
+            insert_ignoring(TableVersion.__table__, ["name"]),
+            [{"name": t, "version": 1, "updated_at": now} for t in tables],
+        )
+
+
+def init_app(app):
+    for name, fn in (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("before_commit", _before_commit),
+        ("after_rollback", _discard),
+    ):
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+def current_select(tables):
+    return select(TableVersion.name, TableVersion.version, TableVersion.updated_at).where(
+        TableVersion.name.in_(tables)
+    )
+
+
+def conditional(*tables):
+    """ETag/Last-Modified a partir de las versiones de `tables`; 304 si no cambió.
+
+    Decora un plan (ver app/plans.py): la consulta de versiones la ejecuta el
+    mismo driver que la vista, sincrónico o async.
+    `tables` también puede ser una única función que devuelve las tablas según
+    el request (p. ej. cuando un parámetro agrega datos de otra tabla).
+    """
+
+    def decorator(plan):
+        @wraps(plan)
+        def wrapper(*args, **kwargs):
+            tables_ = tables[0]() if len(tables) == 1 and callable(tables[0]) else tables
+            found = {
+                row.name: (row.version, row.updated_at) for row in (yield current_select(tables_))
+            }
+            versions = [found.get(t, (0, None)) for t in tables_]
+            # la representación depende de la ruta, los parámetros y el formato pedido
+            key = "|".join(
+                [
+                    request.path,
+                    "&".join(sorted(f"{k}={v}" for k, v in request.args.items(multi=True))),
+                    str(request.accept_mimetypes),
+                    *(f"{t}:{v}" for t, (v, _) in zip(tables_, versions)),
+                ]
+            )
+            etag = hashlib.sha1(key.encode()).hexdigest()
+            stamps = [ts for _, ts in versions if ts is not None]
+            last_modified = max(stamps).replace(tzinfo=timezone.utc) if stamps else None
+            # updated_at tiene resolución de segundos: mientras no termina el
+            # segundo de la última escritura puede llegar otra con la misma
+            # fecha, así que Last-Modified se envía recién cuando ese segundo pasó
+            settled = last_modified is not None and (
+                last_modified + timedelta(seconds=1) <= datetime.now(timezone.utc)
+            )
+
+            if request.if_none_match:
+                # el cliente puede tener la variante comprimida (ETag con sufijo)
+                variant = etag + GZIP_ETAG_SUFFIX
+                if request.if_none_match.contains_weak(variant):
+                    etag = variant
+                fresh = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                fresh = bool(since and last_modified and last_modified <= since)
+            if fresh:
+                resp = make_response("", 304)
+            else:
+                resp = make_response((yield from plan(*args, **kwargs)))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag)
+            if settled:
+                resp.last_modified = last_modified
+            resp.vary.add("Accept")
+            return resp
+
+        return wrapper
+
+    return decorator
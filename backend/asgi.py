@@ -0,0 +1,4 @@
+# Modo ASGI opcional (lecturas con SQLAlchemy async): uvicorn asgi:app
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
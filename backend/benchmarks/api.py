@@ -0,0 +1,434 @@
+"""Benchmark de los endpoints de la API sobre datasets SQLite sembrados.
+
+Arma (y reutiliza) un dataset determinístico por escala en benchmarks/data/,
+ejecuta cada escenario (listados, pedidos de un usuario, export, import y altas) a
+través del test client de Flask o de un gunicorn (o uvicorn, modo ASGI) local, y
+escribe p50/p95/p99, throughput y pico de RSS en un JSON. Con --baseline compara
+el p95 de cada escenario contra un resultado guardado y termina con código 1 si
+alguno empeoró más que --tolerance.
+
+Uso (desde backend/):
+    python benchmarks/api.py --scale 10k
+    python benchmarks/api.py --scale 1m --iterations 50 --output /tmp/1m.json
+    python benchmarks/api.py --scale 10k --baseline benchmarks/baselines/10k.json
+    python benchmarks/api.py --scale 10k --server gunicorn --workers 2
+    python benchmarks/api.py --scale 10k --server uvicorn --workers 2
+
+Escalas (filas de orders; users = orders / 10): 10k, 100k, 1m, 10m.
+Sembrar 1m tarda minutos y 10m bastante más; el archivo queda cacheado.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# sin /apidocs: en producción el modo static exige el spec generado en el build
+os.environ.setdefault("SWAGGER_MODE", "off")
+DATA_DIR = os.path.join(BACKEND, "benchmarks", "data")
+sys.path.insert(0, BACKEND)
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+SEED = 20240101
+BATCH = 50_000
+PRODUCTS = ("Teclado", "Mouse", "Monitor", "Notebook", "Auriculares", "Cámara", "Silla", "Lámpara")
+
+# nombre -> (método, path, iteraciones relativas); {uid} = usuario con muchas órdenes
+SCENARIOS = [
+    ("users_page", "GET", "/users?page=1&limit=100", 1.0),
+    ("users_deep_page", "GET", "/users?page=50&limit=100", 1.0),
+    ("users_cursor", "GET", "/users?cursor=&limit=100&count=none", 1.0),
+    ("users_search", "GET", "/users?q=user12&limit=100", 1.0),
+    ("users_stats", "GET", "/users?include=stats&limit=100", 1.0),
+    ("orders_page", "GET", "/orders?page=1&limit=100", 1.0),
+    ("orders_cursor", "GET", "/orders?cursor=&limit=100&count=none", 1.0),
+    ("orders_search", "GET", "/orders?q=Monitor&limit=100", 1.0),
+    (
+        "orders_amount_range",
+        "GET",
+        "/orders?min_amount=100&max_amount=200&sort=-amount&limit=100",
+        1.0,
+    ),
+    ("orders_user_amount", "GET", "/orders?user_id={uid}&sort=amount&limit=100", 1.0),
+    ("user_orders", "GET", "/users/{uid}/orders?limit=100", 1.0),
+    ("user_summary", "GET", "/users/{uid}/summary", 1.0),
+    ("export_users", "GET", "/export/users", 0.1),
+    ("export_orders_ndjson", "GET", "/export/orders?format=ndjson", 0.1),
+    ("export_orders_csv", "GET", "/export/orders?format=csv", 0.1),
+    ("export_all", "GET", "/export/all", 0.1),
+    ("import_users", "POST", "/import/users", 0.2),
+    ("import_orders", "POST", "/import/orders", 0.2),
+    ("create_user", "POST", "/users", 5.0),
+    ("create_order", "POST", "/orders", 5.0),
+]
+IMPORT_ITEMS = 1000
+
+
+# -------- Dataset --------
+
+
+def dataset_path(scale: str) -> str:
+    return os.path.join(DATA_DIR, f"{scale}.db")
+
+
+def upgrade(path: str):
+    """Aplica las migraciones (índices, FTS, triggers) a la DB SQLite en `path`."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", FLASK_ENV="production")
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app:create_app", "db", "upgrade"],
+        cwd=BACKEND,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+
+def build_dataset(scale: str) -> str:
+    path = dataset_path(scale)
+    if os.path.exists(path):
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    upgrade(tmp)
+
+    n_orders = SCALES[scale]
+    n_users = max(1, n_orders // 10)
+    rng = random.Random(SEED)
+    base = datetime(2024, 1, 1)
+    conn = sqlite3.connect(tmp)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    started = time.perf_counter()
+    with conn:
+        for start in range(1, n_users + 1, BATCH):
+            conn.executemany(
+                "INSERT INTO users (id, name, email, created_at) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        i,
+                        f"Usuario {i}",
+                        f"user{i}@example.com",
+                        (base + timedelta(seconds=i * 30)).isoformat(" "),
+                    )
+                    for i in range(start, min(start + BATCH, n_users + 1))
+                ],
+            )
+        for start in range(1, n_orders + 1, BATCH):
+            conn.executemany(
+                "INSERT INTO orders (id, user_id, product_name, amount, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        j,
+                        _order_user(rng, n_users),
+                        f"{rng.choice(PRODUCTS)} {j % 1000}",
+                        f"{rng.randint(100, 99_999) / 100:.2f}",
+                        (base + timedelta(seconds=j * 3)).isoformat(" "),
+                    )
+                    for j in range(start, min(start + BATCH, n_orders + 1))
+                ],
+            )
+            print(f"  {scale}: {min(start + BATCH - 1, n_orders)}/{n_orders} órdenes", flush=True)
+        conn.execute(
+            "INSERT INTO user_order_stats (user_id, order_count, total_amount, last_order_at) "
+            "SELECT user_id, count(*), sum(amount), max(created_at) FROM orders GROUP BY user_id"
+        )
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    os.replace(tmp, path)
+    print(f"dataset {scale} listo en {time.perf_counter() - started:.0f}s: {path}")
+    return path
+
+
+def _order_user(rng, n_users: int) -> int:
+    # el usuario 1 concentra el 1% de las órdenes (escenario user_orders)
+    return 1 if rng.random() < 0.01 else rng.randint(1, n_users)
+
+
+# -------- Clientes --------
+
+
+class FlaskClient:
+    def __init__(self, db_path: str):
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+        os.environ["FLASK_ENV"] = "production"
+        from app import create_app
+
+        self.client = create_app().test_client()
+
+    def request(self, method: str, path: str, body=None):
+        resp = self.client.open(path, method=method, json=body)
+        resp.get_data()  # consume también los export en streaming
+        return resp.status_code
+
+    def peak_rss_kb(self) -> int:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def close(self):
+        pass
+
+
+class GunicornClient:
+    def __init__(self, db_path: str, workers: int, port: int = 5077):
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", FLASK_ENV="production")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", *self.command(workers, port)],
+            cwd=BACKEND,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+        for _ in range(100):
+            try:
+                self.request("GET", "/health")
+                return
+            except OSError:
+                self.conn.close()
+                time.sleep(0.1)
+        self.close()
+        raise RuntimeError(f"{self.command(workers, port)[0]} no respondió en /health")
+
+    def command(self, workers: int, port: int) -> list:
+        return ["gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "wsgi:app"]
+
+    def request(self, method: str, path: str, body=None):
+        headers, payload = {}, None
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            payload = json.dumps(body)
+        self.conn.request(method, path, body=payload, headers=headers)
+        resp = self.conn.getresponse()
+        resp.read()
+        return resp.status
+
+    def peak_rss_kb(self) -> int:
+        # VmHWM de cada worker (Linux); el máximo entre ellos. uvicorn con un
+        # solo worker atiende en el proceso principal
+        peak = 0
+        children = subprocess.run(
+            ["pgrep", "-P", str(self.proc.pid)], capture_output=True, text=True
+        ).stdout.split()
+        for pid in children or [self.proc.pid]:
+            try:
+                with open(f"/proc/{pid}/status") as fp:
+                    for line in fp:
+                        if line.startswith("VmHWM:"):
+                            peak = max(peak, int(line.split()[1]))
+            except OSError:
+                pass
+        return peak
+
+    def close(self):
+        # esperar la salida libera el puerto para la corrida siguiente
+        self.conn.close()
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class UvicornClient(GunicornClient):
+    """Modo ASGI (asgi.py): lecturas con el engine async; requiere requirements-async.txt."""
+
+    def command(self, workers: int, port: int) -> list:
+        return [
+            "uvicorn",
+            "--workers",
+            str(workers),
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "asgi:app",
+        ]
+
+
+# -------- Ejecución --------
+
+
+def percentile(sorted_values, p: float) -> float:
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+def request_body(name: str, i: int, n_users: int):
+    if name == "create_user":
+        return {"name": f"Bench {i}", "email": f"bench-create{i}@example.com"}
+    if name == "create_order":
+        rng = random.Random(SEED - i)
+        return {"user_id": rng.randint(1, n_users), "product_name": "Bench", "amount": 9.99}
+    if name == "import_users":
+        return {
+            "items": [
+                {"name": f"Bench {i}-{k}", "email": f"bench{i}-{k}@example.com"}
+                for k in range(IMPORT_ITEMS)
+            ]
+        }
+    rng = random.Random(SEED + i)
+    return {
+        "items": [
+            {"user_id": rng.randint(1, n_users), "product_name": "Bench", "amount": 9.99}
+            for _ in range(IMPORT_ITEMS)
+        ]
+    }
+
+
+def run_scenario(client, name, method, path, iterations, n_users):
+    path = path.format(uid=1)
+    # warmup (y chequeo de que el escenario responde bien)
+    warmup = request_body(name, -1, n_users) if method == "POST" else None
+    status = client.request(method, path, warmup)
+    if status >= 400:
+        raise RuntimeError(f"{name}: {method} {path} respondió {status}")
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        body = request_body(name, i, n_users) if method == "POST" else None
+        t0 = time.perf_counter()
+        client.request(method, path, body)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / iterations * 1000, 3),
+        "throughput_rps": round(iterations / elapsed, 2),
+        "peak_rss_mb": round(client.peak_rss_kb() / 1024, 1),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Escenarios cuyo p95 empeoró más que `tolerance` (0.2 = 20%) respecto del baseline."""
+    regressions = []
+    print(f"\n{'escenario':24} {'base p95':>10} {'p95':>10} {'cambio':>8}")
+    for name, res in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        change = res["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        flag = "  <-- regresión" if change > tolerance else ""
+        print(f"{name:24} {base['p95_ms']:10.2f} {res['p95_ms']:10.2f} {change:+8.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=100,
+        help="requests por escenario (export/import usan una fracción)",
+    )
+    parser.add_argument("--only", nargs="*", help="escenarios a ejecutar (por defecto todos)")
+    parser.add_argument("--server", choices=("flask", "gunicorn", "uvicorn"), default="flask")
+    parser.add_argument("--workers", type=int, default=2, help="workers de gunicorn/uvicorn")
+    parser.add_argument("--output", help="archivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="aumento de p95 tolerado respecto del baseline (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    # cada corrida trabaja sobre una copia: los import modifican la DB
+    source = build_dataset(args.scale)
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    db_path = os.path.join(workdir, "bench.db")
+    src, dst = sqlite3.connect(source), sqlite3.connect(db_path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+    # un dataset cacheado puede ser anterior a las últimas migraciones
+    upgrade(db_path)
+
+    n_users = max(1, SCALES[args.scale] // 10)
+    if args.server == "gunicorn":
+        client = GunicornClient(db_path, args.workers)
+    elif args.server == "uvicorn":
+        client = UvicornClient(db_path, args.workers)
+    else:
+        client = FlaskClient(db_path)
+    results = {}
+    try:
+        for name, method, path, share in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            iterations = max(3, int(args.iterations * share))
+            results[name] = res = run_scenario(client, name, method, path, iterations, n_users)
+            print(
+                f"{name:24} p50 {res['p50_ms']:9.2f} ms  p95 {res['p95_ms']:9.2f} ms  "
+                f"p99 {res['p99_ms']:9.2f} ms  {res['throughput_rps']:8.1f} req/s  "
+                f"RSS {res['peak_rss_mb']:7.1f} MB",
+                flush=True,
+            )
+    finally:
+        client.close()
+
+    report = {
+        "meta": {
+            "scale": args.scale,
+            "orders": SCALES[args.scale],
+            "users": n_users,
+            "server": args.server,
+            "workers": args.workers if args.server != "flask" else 1,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "revision": git_revision(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(workdir, f"{args.scale}.json")
+    with open(output, "w") as fp:
+        json.dump(report, fp, indent=2)
+        fp.write("\n")
+    print(f"\nresultados: {output}")
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions = compare(results, json.load(fp), args.tolerance)
+        if regressions:
+            sys.exit(f"regresiones de p95 > {args.tolerance:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Microbenchmark de serialización de listados.
+
+Compara, sobre las mismas filas, el camino anterior (entidades ORM + dict por
+fila + json.dumps) con el actual (SELECT Core + encoders de services/rows.py),
+verifica que ambos producen los mismos bytes e imprime el costo por fila.
+
+Uso (desde backend/):
+    python benchmarks/serialization.py [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def setup(n_rows: int):
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ.setdefault("FLASK_ENV", "production")
+    os.environ.setdefault("SWAGGER_MODE", "off")
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Order, User
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        base = datetime(2024, 1, 1)
+        n_users = max(1, n_rows // 10)
+        db.session.execute(
+            User.__table__.insert(),
+            [
+                {
+                    "id": i,
+                    "name": f"Usuario Ñandú {i}",
+                    "email": f"user{i}@example.com",
+                    "created_at": base + timedelta(minutes=i),
+                }
+                for i in range(1, n_users + 1)
+            ],
+        )
+        db.session.execute(
+            Order.__table__.insert(),
+            [
+                {
+                    "id": i,
+                    "user_id": 1 + i % n_users,
+                    "product_name": f'Producto "{i}"',
+                    "amount": Decimal(i % 997) + Decimal("0.99"),
+                    "created_at": base + timedelta(seconds=i),
+                }
+                for i in range(1, n_rows + 1)
+            ],
+        )
+        db.session.commit()
+    return app
+
+
+def orm_orders(app):
+    from sqlalchemy.orm import selectinload
+
+    from app.models import Order
+
+    orders = Order.query.options(selectinload(Order.user)).order_by(Order.id.desc()).all()
+    data = [
+        {
+            "id": o.id,
+            "user_id": o.user_id,
+            "product_name": o.product_name,
+            "amount": float(o.amount),
+            "created_at": o.created_at.isoformat(),
+            "user": {"id": o.user.id, "name": o.user.name, "email": o.user.email}
+            if o.user
+            else None,
+        }
+        for o in orders
+    ]
+    return app.json.dumps({"items": data}, separators=(",", ":"))
+
+
+def row_orders(app):
+    from app.extensions import db
+    from app.models import Order
+    from app.services import rows
+
+    result = db.session.execute(rows.orders_select(with_user=True).order_by(Order.id.desc()))
+    data = rows.encode_rows(rows.encode_order_user, result)
+    return app.json.dumps({"items": data}, separators=(",", ":"))
+
+
+def measure(fn, app, repeat: int) -> float:
+    from app.extensions import db
+
+    best = float("inf")
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn(app)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = setup(args.rows)
+    with app.app_context():
+        if orm_orders(app) != row_orders(app):
+            sys.exit("las salidas no coinciden")
+        orm = measure(orm_orders, app, args.repeat)
+        fast = measure(row_orders, app, args.repeat)
+
+    per_row = 1e6 / args.rows
+    print(f"filas: {args.rows} (mejor de {args.repeat})")
+    print(f"ORM + dicts + json.dumps : {orm * 1000:8.1f} ms  {orm * per_row:6.2f} µs/fila")
+    print(f"Core + encoders          : {fast * 1000:8.1f} ms  {fast * per_row:6.2f} µs/fila")
+    print(f"speedup                  : {orm / fast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
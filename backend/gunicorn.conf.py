@@ -0,0 +1,80 @@
+# backend/gunicorn.conf.py
+# Configuración de producción de gunicorn (se carga sola al correr `gunicorn wsgi:app`
+# desde backend/; los flags de línea de comando tienen prioridad).
+# - preload_app: la app se importa una vez en el master y los workers la heredan
+#   por fork (copy-on-write: menos RSS por worker y arranque más rápido). Los
+#   engines no deben compartir conexiones entre procesos: post_fork los descarta
+#   en cada worker, que abre las suyas en el primer uso.
+# - gthread por defecto: los export en streaming y los jobs esperan IO, así que
+#   unos pocos procesos con varios hilos rinden más que muchos procesos sync.
+#   GUNICORN_WORKER_CLASS=sync|gthread|gevent (gevent requiere instalarlo).
+# - max_requests con jitter recicla los workers de a uno para acotar el
+#   crecimiento de memoria sin reiniciarlos todos a la vez.
+# - Con PROMETHEUS_MULTIPROC_DIR, los archivos de métricas se limpian al
+#   arrancar y se marcan los de cada worker que termina (ver app/metrics.py).
+# - SWAGGER_MODE=static (default en producción) sirve app/static/openapi.json,
+#   que genera el build (`npm run build -w backend`); sin él la app no arranca.
+import glob
+import multiprocessing
+import os
+
+cpus = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "gthread":
+    # hilos por worker; los procesos, uno por CPU (más uno para cubrir pausas)
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+    workers = int(os.getenv("WEB_CONCURRENCY", str(cpus + 1)))
+elif worker_class == "gevent":
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+    workers = int(os.getenv("WEB_CONCURRENCY", str(cpus)))
+else:
+    workers = int(os.getenv("WEB_CONCURRENCY", str(cpus * 2 + 1)))
+
+# gevent parchea la stdlib en cada worker: la app no debe importarse antes
+preload_app = os.getenv("GUNICORN_PRELOAD", "0" if worker_class == "gevent" else "1") == "1"
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = os.getenv("GUNICORN_ACCESSLOG")  # "-" para stdout
+
+# Métricas multiproceso: valores de una ejecución anterior falsearían contadores
+# y gauges. Se limpia acá (este archivo se lee antes del preload, que ya crea
+# métricas) y una sola vez: un reload (HUP) vuelve a leerlo con workers vivos.
+_prom_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _prom_dir and not os.getenv("_GUNICORN_PROM_DIR_READY"):
+    os.makedirs(_prom_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(_prom_dir, "*.db")):
+        os.remove(path)
+    os.environ["_GUNICORN_PROM_DIR_READY"] = "1"
+
+def when_ready(server):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # el master no atiende requests: sus gauges (p. ej. capacidad del pool,
+        # fijada al crear el engine en el preload) no deben sumarse
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    from app.extensions import db
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False: las conexiones heredadas son del master; solo se
+            # abandonan y el pool nuevo abre las propias de este worker
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -90,21 +90,45 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # las tablas FTS5 (y sus tablas internas) se gestionan a mano en la
+    # migración de búsqueda; autogenerate no debe proponer borrarlas
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == "table" and reflected and compare_to is None and "_fts" in name:
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        foreign_keys = None
+        if connection.dialect.name == "sqlite":
+            # la app abre las conexiones con foreign_keys=ON; los batch de
+            # Alembic recrean tablas y con FKs activas un DROP dispararía los
+            # ON DELETE CASCADE de las tablas hijas. Se restaura al terminar
+            # porque la conexión vuelve al pool.
+            foreign_keys = connection.exec_driver_sql("PRAGMA foreign_keys").scalar()
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
             **conf_args
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if foreign_keys:
+                connection.rollback()
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+                connection.commit()
 
 
 if context.is_offline_mode():
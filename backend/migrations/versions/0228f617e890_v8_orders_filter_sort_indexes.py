@@ -0,0 +1,30 @@
+"""V8: orders indexes for GET /orders filters and sort (amount, user_id)
+
+Revision ID: 0228f617e890
+Revises: e079e8aabe06
+Create Date: 2026-10-18 21:29:55.847346
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0228f617e890'
+down_revision = 'e079e8aabe06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_amount_id', ['amount', 'id'], unique=False)
+        batch_op.create_index('ix_orders_user_amount', ['user_id', 'amount', 'id'], unique=False)
+        batch_op.create_index('ix_orders_user_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_id')
+        batch_op.drop_index('ix_orders_user_amount')
+        batch_op.drop_index('ix_orders_amount_id')
@@ -0,0 +1,32 @@
+"""V9: ix_orders_user_created with id as tiebreaker (user_id, created_at, id)
+
+Revision ID: 66ac6cb7ce83
+Revises: 0228f617e890
+Create Date: 2026-10-18 22:10:41.512930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '66ac6cb7ce83'
+down_revision = '0228f617e890'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite ya desempata por rowid (= id) en cualquier índice; Postgres no:
+    # sin id, el orden (created_at, id) de una página por usuario necesita un sort
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_created')
+        batch_op.create_index(
+            'ix_orders_user_created', ['user_id', 'created_at', 'id'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_created')
+        batch_op.create_index('ix_orders_user_created', ['user_id', 'created_at'], unique=False)
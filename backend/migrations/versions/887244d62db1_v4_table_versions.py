@@ -0,0 +1,33 @@
+"""V4: table_versions (write generation per table for ETag/Last-Modified)
+
+Revision ID: 887244d62db1
+Revises: f0e05d38fb2f
+Create Date: 2026-10-18 21:15:04.640912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '887244d62db1'
+down_revision = 'f0e05d38fb2f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table_versions, [
+        {'name': 'users', 'version': 0, 'updated_at': None},
+        {'name': 'orders', 'version': 0, 'updated_at': None},
+    ])
+
+
+def downgrade():
+    op.drop_table('table_versions')
@@ -0,0 +1,36 @@
+"""V5: user_order_stats (materialized per-user order summary)
+
+Revision ID: aa679c550cae
+Revises: 887244d62db1
+Create Date: 2026-10-18 21:31:48.205317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'aa679c550cae'
+down_revision = '887244d62db1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_order_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('last_order_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # backfill con las órdenes existentes
+    op.execute(
+        "INSERT INTO user_order_stats (user_id, order_count, total_amount, last_order_at) "
+        "SELECT user_id, COUNT(*), SUM(amount), MAX(created_at) FROM orders GROUP BY user_id"
+    )
+
+
+def downgrade():
+    op.drop_table('user_order_stats')
@@ -0,0 +1,82 @@
+"""V3: text search indexes for ?q= (FTS5 trigram on SQLite, pg_trgm on Postgres)
+
+Revision ID: f0e05d38fb2f
+Revises: 41187b124b25
+Create Date: 2026-10-18 21:02:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f0e05d38fb2f'
+down_revision = '41187b124b25'
+branch_labels = None
+depends_on = None
+
+# tabla -> columnas indexadas (ver app/services/search.py)
+SEARCH_COLUMNS = {
+    'users': ('name', 'email'),
+    'orders': ('product_name',),
+}
+
+
+def _sqlite_upgrade():
+    for tablename, cols in SEARCH_COLUMNS.items():
+        fts = f'{tablename}_fts'
+        col_list = ', '.join(cols)
+        new_values = ', '.join(f'new.{c}' for c in cols)
+        old_values = ', '.join(f'old.{c}' for c in cols)
+        # tabla FTS "external content": no duplica el texto, solo el índice
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({col_list}, "
+            f"content='{tablename}', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {tablename} BEGIN "
+            f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {tablename} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {tablename} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_values}); END"
+        )
+        # indexa las filas existentes
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _sqlite_downgrade():
+    for tablename in SEARCH_COLUMNS:
+        fts = f'{tablename}_fts'
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_upgrade()
+    elif dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for tablename, cols in SEARCH_COLUMNS.items():
+            for col in cols:
+                op.create_index(
+                    f'ix_{tablename}_{col}_trgm', tablename, [sa.text(f'{col} gin_trgm_ops')],
+                    postgresql_using='gin',
+                )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_downgrade()
+    elif dialect == 'postgresql':
+        for tablename, cols in SEARCH_COLUMNS.items():
+            for col in cols:
+                op.drop_index(f'ix_{tablename}_{col}_trgm', table_name=tablename)
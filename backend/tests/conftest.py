@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+os.environ["FLASK_ENV"] = "testing"
+
+from flask_migrate import upgrade  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.services import counts  # noqa: E402
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+
+@pytest.fixture
+def app():
+    # SQLite en memoria (TestConfig) con el esquema de las migraciones: FTS,
+    # triggers e índices iguales a los de producción
+    # la memo de totales es del proceso: que no queden totales de la DB de otro test
+    counts.clear()
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(client):
+    resp = client.post("/users", json={"name": "Ana", "email": "ana@example.com"})
+    assert resp.status_code == 201
+    return resp.get_json()
@@ -0,0 +1,23 @@
+import pytest
+
+from app import apidocs, create_app
+from app.config import TestConfig
+
+
+def test_static_mode_without_the_built_spec_fails_at_startup(monkeypatch, tmp_path):
+    monkeypatch.setattr(TestConfig, "SWAGGER_MODE", "static")
+    monkeypatch.setattr(apidocs, "spec_path", lambda app: str(tmp_path / "openapi.json"))
+
+    with pytest.raises(RuntimeError, match="openapi-dump"):
+        create_app()
+
+
+def test_dump_spec_with_docs_off(monkeypatch, tmp_path):
+    # lo que corre el build: SWAGGER_MODE=off flask openapi-dump
+    monkeypatch.setattr(TestConfig, "SWAGGER_MODE", "off")
+    app = create_app()
+    path = apidocs.dump_spec(app, str(tmp_path / "openapi.json"))
+
+    spec = (tmp_path / "openapi.json").read_text(encoding="utf-8")
+    assert path.endswith("openapi.json")
+    assert '"/orders/batch"' in spec
@@ -0,0 +1,60 @@
+import gzip
+
+import pytest
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def orders(client, user):
+    items = [
+        {"user_id": user["id"], "product_name": f"Producto {i}", "amount": 1 + i} for i in range(40)
+    ]
+    client.post("/orders/batch", json={"orders": items})
+
+
+def test_large_json_is_gzipped_with_its_own_etag(client, orders):
+    plain = client.get("/orders?limit=100")
+    zipped = client.get("/orders?limit=100", headers=GZIP)
+
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+    assert gzip.decompress(zipped.data) == plain.data
+    assert len(zipped.data) < len(plain.data)
+    assert zipped.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+
+def test_gzip_etag_revalidates(client, orders):
+    etag = client.get("/orders?limit=100", headers=GZIP).headers["ETag"]
+
+    resp = client.get("/orders?limit=100", headers={**GZIP, "If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+
+
+def test_small_responses_are_not_compressed(client, user):
+    resp = client.get("/users", headers=GZIP)
+    assert "Content-Encoding" not in resp.headers
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_streamed_export_is_gzipped(app, client, orders, fmt):
+    app.config["EXPORT_CHUNK_SIZE"] = 7
+    plain = client.get(f"/export/orders?format={fmt}")
+
+    zipped = client.get(f"/export/orders?format={fmt}", headers=GZIP)
+
+    assert zipped.is_streamed
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in zipped.headers
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+
+
+def test_csv_export(client, orders):
+    lines = client.get("/export/orders?format=csv").get_data(as_text=True).splitlines()
+
+    assert lines[0] == "id,user_id,product_name,amount,created_at"
+    assert len(lines) == 41
+    assert lines[1].split(",")[2:4] == ["Producto 0", "1.0"]
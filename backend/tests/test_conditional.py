@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+from werkzeug.http import http_date
+
+from app.extensions import db
+from app.models.table_version import TableVersion
+
+
+def age_versions(seconds: int = 10):
+    # como si la última escritura hubiera sido hace `seconds` segundos
+    past = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    db.session.execute(update(TableVersion).values(updated_at=past - timedelta(seconds=seconds)))
+    db.session.commit()
+
+
+def test_matching_etag_returns_304(client, user):
+    etag = client.get("/users").headers["ETag"]
+    resp = client.get("/users", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+
+def test_echoed_last_modified_returns_304(client, user):
+    age_versions()
+    last_modified = client.get("/users").headers["Last-Modified"]
+
+    resp = client.get("/users", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 304
+
+
+def test_write_after_last_modified_returns_200(client, user):
+    age_versions()
+    last_modified = client.get("/users").headers["Last-Modified"]
+    client.post("/users", json={"name": "Beto", "email": "beto@example.com"})
+
+    resp = client.get("/users", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 200
+    assert len(resp.get_json()["items"]) == 2
+
+
+def test_no_last_modified_until_the_write_second_has_passed(client, user):
+    # otra escritura en este mismo segundo tendría la misma fecha; se repite si
+    # el request cruzó el cambio de segundo
+    for _ in range(3):
+        age_versions(0)
+        second = datetime.now(timezone.utc).replace(microsecond=0)
+        resp = client.get("/users")
+        if datetime.now(timezone.utc).replace(microsecond=0) == second:
+            break
+    assert "Last-Modified" not in resp.headers
+    assert "ETag" in resp.headers
+
+
+def test_if_modified_since_after_the_last_write_returns_304(client, user):
+    later = datetime.now(timezone.utc) + timedelta(seconds=2)
+    resp = client.get("/users", headers={"If-Modified-Since": http_date(later)})
+    assert resp.status_code == 304
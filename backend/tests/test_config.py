@@ -0,0 +1,62 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from app import create_app
+from app.config import TestConfig, engine_options, load_config
+from app.extensions import db
+
+FILE_URI = "sqlite:////tmp/app.db"
+PG_URI = "postgresql://app:secret@db/app"
+
+
+def loaded(monkeypatch, env):
+    monkeypatch.setenv("FLASK_ENV", env)
+    app = Flask(__name__)
+    load_config(app)
+    return app.config
+
+
+@pytest.mark.parametrize("env, size, overflow", [("development", 2, 3), ("production", 10, 20)])
+def test_pool_profile_per_environment(monkeypatch, env, size, overflow):
+    config = loaded(monkeypatch, env)
+    options = engine_options(config, PG_URI)
+    assert (options["pool_size"], options["max_overflow"]) == (size, overflow)
+
+
+def test_pre_ping_and_recycle_only_for_a_db_server(monkeypatch):
+    config = loaded(monkeypatch, "production")
+
+    assert engine_options(config, "sqlite:///:memory:") == {}
+    assert engine_options(config, FILE_URI).keys() == {"pool_size", "max_overflow", "pool_timeout"}
+    server = engine_options(config, PG_URI)
+    assert server["pool_pre_ping"] is True
+    assert server["pool_recycle"] == 1800
+
+
+def test_replica_bind_gets_the_pool_profile(monkeypatch):
+    monkeypatch.setattr(TestConfig, "DATABASE_READ_URL", PG_URI)
+    config = loaded(monkeypatch, "testing")
+    assert config["SQLALCHEMY_BINDS"]["replica"] == {
+        "url": PG_URI,
+        **engine_options(config, PG_URI),
+    }
+
+
+def test_file_sqlite_engine_gets_pool_and_pragmas(monkeypatch, tmp_path):
+    monkeypatch.setattr(TestConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/app.db")
+    app = create_app()
+    with app.app_context():
+        engine = db.engine
+        assert engine.pool.size() == app.config["DB_POOL_SIZE"]
+        with engine.connect() as conn:
+
+            def pragma(name):
+                return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == 5000
+            assert pragma("foreign_keys") == 1
+            assert pragma("cache_size") == -65536
+        engine.dispose()
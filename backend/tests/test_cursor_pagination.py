@@ -0,0 +1,47 @@
+def walk(client, path, limit=3):
+    """Recorre un listado con ?cursor= hasta el final; devuelve los ids en orden."""
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = client.get(f"{path}?limit={limit}&cursor={cursor}").get_json()
+        assert len(body["items"]) <= limit
+        ids += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+    return ids
+
+
+def create_users(client, n, start=0):
+    # varios en el mismo segundo: empates de created_at que desempata el id
+    return [
+        client.post("/users", json={"name": f"U{i}", "email": f"u{i}@example.com"}).get_json()["id"]
+        for i in range(start, start + n)
+    ]
+
+
+def test_users_cursor_walk_has_no_duplicates_or_gaps(client):
+    ids = create_users(client, 10)
+
+    assert walk(client, "/users") == sorted(ids, reverse=True)
+
+
+def test_orders_cursor_walk_has_no_duplicates_or_gaps(client, user):
+    orders = [{"user_id": user["id"], "product_name": f"P{i}", "amount": 1 + i} for i in range(10)]
+    created = client.post("/orders/batch", json={"orders": orders}).get_json()["items"]
+
+    assert walk(client, "/orders", limit=4) == sorted((o["id"] for o in created), reverse=True)
+
+
+def test_inserts_between_pages_do_not_shift_the_walk(client):
+    ids = create_users(client, 6)
+    first = client.get("/users?limit=3&cursor=").get_json()
+
+    create_users(client, 3, start=6)  # más nuevas: quedan antes del cursor
+    rest = client.get(f"/users?limit=10&cursor={first['next_cursor']}").get_json()
+
+    seen = [u["id"] for u in first["items"] + rest["items"]]
+    assert seen == sorted(ids, reverse=True)
+    assert rest["next_cursor"] is None
+
+
+def test_invalid_cursor(client):
+    resp = client.get("/users?cursor=zzz")
+    assert resp.status_code == 400
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def data(app, client):
+    users = [
+        client.post("/users", json={"name": f"U{i}", "email": f"u{i}@example.com"}).get_json()
+        for i in range(5)
+    ]
+    orders = [
+        {"user_id": u["id"], "product_name": f"P{n}", "amount": 1.5 + n}
+        for n, u in enumerate(users * 2)
+    ]
+    client.post("/orders/batch", json={"orders": orders})
+    # bloques más chicos que las tablas: el export recorre varios
+    app.config["EXPORT_CHUNK_SIZE"] = 3
+    return users
+
+
+def ndjson(resp):
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+
+@pytest.mark.parametrize("name", ["users", "orders"])
+def test_ndjson_export_streams_the_same_rows_as_json(client, data, name):
+    resp = client.get(f"/export/{name}?format=ndjson")
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    assert resp.is_streamed
+    items = client.get(f"/export/{name}").get_json()["items"]
+    assert ndjson(resp) == items
+    assert len(items) == {"users": 5, "orders": 10}[name]
+
+
+def test_ndjson_export_all_tags_each_line(client, data):
+    lines = ndjson(client.get("/export/all?format=ndjson"))
+    body = client.get("/export/all").get_json()
+
+    assert [line["data"] for line in lines if line["type"] == "user"] == body["users"]
+    assert [line["data"] for line in lines if line["type"] == "order"] == body["orders"]
+    assert len(lines) == 15
+
+
+def test_ndjson_is_negotiated_with_accept(client, data):
+    resp = client.get("/export/users", headers={"Accept": "application/x-ndjson"})
+    assert resp.mimetype == "application/x-ndjson"
+    assert len(ndjson(resp)) == 5
+
+
+def test_unknown_export_format(client):
+    resp = client.get("/export/all?format=csv")
+    assert resp.status_code == 400
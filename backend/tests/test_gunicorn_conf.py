@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import runpy
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+CPUS = multiprocessing.cpu_count()
+
+
+@pytest.fixture
+def load(monkeypatch):
+    for name in (
+        "GUNICORN_WORKER_CLASS",
+        "WEB_CONCURRENCY",
+        "GUNICORN_PRELOAD",
+        "PROMETHEUS_MULTIPROC_DIR",
+        "_GUNICORN_PROM_DIR_READY",
+    ):
+        monkeypatch.delenv(name, raising=False)
+
+    def load(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(CONF)
+
+    return load
+
+
+def test_gthread_by_default_with_preload(load):
+    conf = load()
+    assert conf["worker_class"] == "gthread"
+    assert (conf["workers"], conf["threads"]) == (CPUS + 1, 4)
+    assert conf["preload_app"] is True
+    assert 0 < conf["max_requests_jitter"] < conf["max_requests"]
+
+
+def test_sync_workers(load):
+    conf = load(GUNICORN_WORKER_CLASS="sync")
+    assert conf["workers"] == CPUS * 2 + 1
+    assert "threads" not in conf
+
+
+def test_gevent_does_not_preload(load):
+    conf = load(GUNICORN_WORKER_CLASS="gevent", WEB_CONCURRENCY="3")
+    assert conf["workers"] == 3
+    assert conf["preload_app"] is False
+
+
+def test_stale_metric_files_are_cleared_once(load, tmp_path):
+    (tmp_path / "counter_1.db").write_bytes(b"")
+    load(PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+    # un reload (HUP) vuelve a leer el archivo con workers vivos: no se borra
+    (tmp_path / "counter_2.db").write_bytes(b"")
+    load()
+    assert [p.name for p in tmp_path.iterdir()] == ["counter_2.db"]
+
+
+def test_post_fork_gives_the_worker_its_own_pool(load, app):
+    conf = load()
+    inherited = db.engine.pool
+    server = SimpleNamespace(
+        cfg=SimpleNamespace(preload_app=True), app=SimpleNamespace(wsgi=lambda: app)
+    )
+
+    conf["post_fork"](server, worker=None)
+
+    assert db.engine.pool is not inherited
@@ -0,0 +1,70 @@
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Order
+from app.services.idempotency import keys
+
+ORDER = {"product_name": "Teclado", "amount": 10.5}
+
+
+def post_order(client, key, body):
+    return client.post("/orders", json=body, headers={"Idempotency-Key": key})
+
+
+def order_count():
+    return db.session.execute(select(func.count()).select_from(Order)).scalar()
+
+
+def test_retry_replays_the_stored_response(client, user):
+    body = {**ORDER, "user_id": user["id"]}
+    first = post_order(client, "k-1", body)
+    retry = post_order(client, "k-1", body)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert order_count() == 1
+
+
+def test_same_key_with_another_body_is_rejected(client, user):
+    post_order(client, "k-2", {**ORDER, "user_id": user["id"]})
+    resp = post_order(client, "k-2", {**ORDER, "user_id": user["id"], "amount": 99})
+
+    assert resp.status_code == 422
+    assert resp.get_json()["error"]["code"] == "idempotency_key_reused"
+    assert order_count() == 1
+
+
+def test_key_in_flight_returns_409(client, user):
+    body = {**ORDER, "user_id": user["id"]}
+    post_order(client, "k-3", body)
+    # reserva sin respuesta: el request original todavía no terminó
+    db.session.execute(keys.update().where(keys.c.key == "k-3").values(status_code=None))
+    db.session.commit()
+
+    resp = post_order(client, "k-3", body)
+    assert resp.status_code == 409
+    assert resp.get_json()["error"]["code"] == "idempotency_key_in_progress"
+    assert order_count() == 1
+
+
+def test_validation_422_is_replayed(client):
+    body = {**ORDER, "user_id": 1, "amount": -1}
+    first = post_order(client, "k-4", body)
+    retry = post_order(client, "k-4", body)
+
+    assert first.status_code == retry.status_code == 422
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+
+def test_missing_user_422_is_replayed(client, user):
+    # el 422 de la FK llega después de un rollback que se lleva la reserva
+    body = {**ORDER, "user_id": user["id"] + 100}
+    first = post_order(client, "k-5", body)
+    retry = post_order(client, "k-5", body)
+
+    assert first.status_code == retry.status_code == 422
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert order_count() == 0
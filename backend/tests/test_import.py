@@ -0,0 +1,167 @@
+import gzip
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.extensions import db
+from app.models import User
+from app.query_guard import max_queries
+
+
+def import_json(client, path, items):
+    return client.post(path, json={"items": items})
+
+
+def emails():
+    return sorted(db.session.execute(select(User.email)).scalars())
+
+
+# -------- /import/users --------
+
+
+def test_import_users_skips_invalid_and_repeated_emails(app, client, user):
+    app.config["IMPORT_CHUNK_SIZE"] = 3
+    items = [
+        {"name": "Beto", "email": "beto@example.com"},
+        {"name": "Ana otra vez", "email": "ANA@example.com"},  # ya está en la DB
+        {"name": "Beto bis", "email": "beto@example.com"},  # repetido en el bloque
+        {"name": "Caro", "email": "caro@example.com"},
+        "no es un objeto",
+        {"name": "Sin email"},
+        {"name": "Beto tris", "email": "Beto@Example.com"},  # repetido en otro bloque
+    ]
+
+    resp = import_json(client, "/import/users", items)
+
+    assert resp.status_code == 201
+    assert resp.get_json() == {"created": 2, "skipped": 5}
+    assert emails() == ["ana@example.com", "beto@example.com", "caro@example.com"]
+    assert 'chunks;desc="3"' in resp.headers["Server-Timing"]
+
+
+def test_import_users_queries_do_not_grow_with_the_rows(client):
+    def queries(n, start):
+        items = [{"name": f"U{i}", "email": f"u{i}@example.com"} for i in range(start, start + n)]
+        return int(import_json(client, "/import/users", items).headers["X-Query-Count"])
+
+    assert queries(5, 0) == queries(200, 5)
+    assert len(emails()) == 205
+
+
+# -------- /import/orders --------
+
+
+def test_import_orders_resolves_each_user_once(app, client, user):
+    app.config["IMPORT_CHUNK_SIZE"] = 2
+    uid = user["id"]
+    items = [
+        {"user_id": uid, "product_name": "Mouse", "amount": 5},
+        {"user_id": uid + 1, "product_name": "Sin usuario", "amount": 5},
+        {"user_id": uid, "product_name": "Monitor", "amount": "120.5"},
+        {"user_id": uid + 1, "product_name": "Sin usuario", "amount": 7},
+        {"user_id": uid, "product_name": "Gratis", "amount": 0},
+        {"user_id": uid, "product_name": "", "amount": 3},
+        {"user_id": "x", "product_name": "Teclado", "amount": 3},
+    ]
+
+    with max_queries(50) as executed:
+        resp = import_json(client, "/import/orders", items)
+
+    assert resp.status_code == 201
+    assert resp.get_json() == {"created": 2, "skipped": 5}
+    # 4 bloques, pero cada user_id se consulta una sola vez en todo el import
+    lookups = [s for s in executed if s.lstrip().startswith("SELECT users.id")]
+    assert len(lookups) == 1
+    orders = client.get("/orders").get_json()["items"]
+    assert sorted((o["product_name"], o["amount"]) for o in orders) == [
+        ("Monitor", 120.5),
+        ("Mouse", 5.0),
+    ]
+
+
+# -------- Bodies NDJSON, CSV y gzip --------
+
+NDJSON = (
+    b'{"name": "Ana", "email": "ana@example.com"}\n'
+    b"\n"
+    b"no es json\n"
+    b'{"name": "Beto", "email": "beto@example.com"}\n'
+)
+CSV = "﻿name,email\nAna,ana@example.com\nJosé,jose@example.com\n,sin-nombre@example.com\n"
+
+
+def post_body(client, path, body, mimetype, gzipped=False):
+    headers = {"Content-Type": mimetype}
+    if gzipped:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    return client.post(path, data=body, headers=headers)
+
+
+def test_import_ndjson_body(client):
+    resp = post_body(client, "/import/users", NDJSON, "application/x-ndjson")
+
+    assert resp.status_code == 201
+    assert resp.get_json() == {"created": 2, "skipped": 1}
+
+
+def test_import_csv_body(client):
+    resp = post_body(client, "/import/users", CSV.encode(), "text/csv")
+
+    assert resp.get_json() == {"created": 2, "skipped": 1}
+    assert emails() == ["ana@example.com", "jose@example.com"]
+
+
+def test_import_orders_csv_body(client, user):
+    body = f"user_id,product_name,amount\n{user['id']},Mouse,5.5\n{user['id']},Teclado,-1\n"
+    resp = post_body(client, "/import/orders", body.encode(), "text/csv")
+    assert resp.get_json() == {"created": 1, "skipped": 1}
+
+
+@pytest.mark.parametrize(
+    "body, mimetype",
+    [
+        (NDJSON, "application/x-ndjson"),
+        (CSV.encode(), "text/csv"),
+        (b'{"items": []}', "application/json"),
+    ],
+)
+def test_import_gzip_body(client, body, mimetype):
+    plain = post_body(client, "/import/users", body, mimetype).get_json()
+    db.session.execute(delete(User))
+    db.session.commit()
+
+    resp = post_body(client, "/import/users", body, mimetype, gzipped=True)
+
+    assert resp.status_code == 201
+    assert resp.get_json() == plain
+
+
+def test_import_truncated_gzip_is_rejected(client):
+    body = gzip.compress(NDJSON)[:-12]
+    resp = client.post(
+        "/import/users",
+        data=body,
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+    )
+
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == {
+        "code": "invalid_body",
+        "message": "Body gzip inválido o truncado",
+    }
+
+
+def test_import_non_utf8_body_is_rejected(client):
+    resp = post_body(
+        client, "/import/users", "name,email\nJosé,j@x.com\n".encode("latin-1"), "text/csv"
+    )
+    assert resp.status_code == 400
+    assert resp.get_json()["error"]["message"] == "El body debe estar en UTF-8"
+
+
+def test_import_unsupported_encoding(client):
+    resp = client.post(
+        "/import/users", data=b"x", headers={"Content-Type": "text/csv", "Content-Encoding": "br"}
+    )
+    assert resp.status_code == 415
@@ -0,0 +1,112 @@
+import gzip
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import Job
+from app.services import jobs
+
+
+@pytest.fixture(autouse=True)
+def jobs_dir(app, tmp_path):
+    app.config["JOBS_DIR"] = str(tmp_path)
+    return tmp_path
+
+
+def poll(client, resp):
+    assert resp.status_code == 202
+    return client.get(resp.headers["Location"]).get_json()
+
+
+def test_import_job_submit_poll_result(client):
+    body = b'{"name": "Ana", "email": "ana@example.com"}\n{"name": "Beto", "email": "beto@x.com"}\n'
+    resp = client.post(
+        "/jobs/import/users", data=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    job = poll(client, resp)
+    assert job["status"] == "succeeded"
+    assert (job["processed"], job["created"], job["skipped"]) == (2, 2, 0)
+    assert client.get(f"/jobs/{job['id']}/result").get_json() == {"created": 2, "skipped": 0}
+    assert os.listdir(jobs.jobs_dir()) == []  # la entrada se borra al terminar
+
+
+def test_export_job_downloads_the_file(client, user):
+    job = poll(client, client.post("/jobs/export/users?format=ndjson"))
+    assert job["status"] == "succeeded"
+    assert job["rows"] == 1
+
+    result = client.get(f"/jobs/{job['id']}/result")
+    assert result.status_code == 200
+    assert result.mimetype == "application/x-ndjson"
+    assert b"ana@example.com" in result.data
+
+
+def test_failed_job_reports_the_error(client):
+    resp = client.post(
+        "/jobs/import/users",
+        data=gzip.compress(b'{"name": "Ana"}\n')[:-8],
+        headers={"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"},
+    )
+
+    job = poll(client, resp)
+    assert job["status"] == "failed"
+    assert job["error"] == "Body gzip inválido o truncado"
+    result = client.get(f"/jobs/{job['id']}/result")
+    assert result.status_code == 409
+    assert result.get_json()["error"]["details"] == {"error": job["error"]}
+
+
+def test_cleanup_fails_stale_jobs_and_purges_expired_files(app, jobs_dir):
+    now = jobs._now()
+    stale_input = jobs_dir / "stale.input"
+    stale_input.write_bytes(b"{}")
+    old_export = jobs_dir / "old.ndjson"
+    old_export.write_text("")
+    day_ago = time.time() - 25 * 3600
+    os.utime(old_export, (day_ago, day_ago))
+    fresh_export = jobs_dir / "fresh.ndjson"
+    fresh_export.write_text("")
+    db.session.add_all(
+        [
+            Job(
+                id="stale",
+                kind="import_users",
+                status="running",
+                params={"input": str(stale_input)},
+                updated_at=now - timedelta(hours=1),
+            ),
+            Job(id="alive", kind="import_users", status="running", updated_at=now),
+            Job(
+                id="old",
+                kind="export_users",
+                status="succeeded",
+                finished_at=now - timedelta(hours=25),
+            ),
+            Job(id="fresh", kind="export_users", status="succeeded", finished_at=now),
+        ]
+    )
+    db.session.commit()
+
+    assert jobs.cleanup() == {"reaped": 1, "jobs": 1, "files": 1}
+
+    db.session.expire_all()
+    assert db.session.get(Job, "stale").status == "failed"
+    assert db.session.get(Job, "alive").status == "running"
+    assert db.session.get(Job, "old") is None
+    assert db.session.get(Job, "fresh") is not None
+    assert sorted(os.listdir(jobs_dir)) == ["fresh.ndjson"]
+
+
+def test_reaped_job_is_not_run(app):
+    db.session.add(Job(id="gone", kind="export_users", status="failed", params={"format": "json"}))
+    db.session.commit()
+
+    jobs._run(app, "gone")
+
+    db.session.expire_all()
+    job = db.session.get(Job, "gone")
+    assert (job.status, job.started_at) == ("failed", None)
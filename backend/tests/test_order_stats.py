@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Order, User, UserOrderStats
+from app.seeds import seed_faker
+
+
+def expected_stats():
+    """Resumen recalculado desde orders, para comparar con user_order_stats."""
+    rows = db.session.execute(
+        select(Order.user_id, func.count(), func.sum(Order.amount), func.max(Order.created_at))
+        .group_by(Order.user_id)
+        .order_by(Order.user_id)
+    ).all()
+    return [tuple(r) for r in rows]
+
+
+def stored_stats():
+    rows = db.session.execute(
+        select(
+            UserOrderStats.user_id,
+            UserOrderStats.order_count,
+            UserOrderStats.total_amount,
+            UserOrderStats.last_order_at,
+        ).order_by(UserOrderStats.user_id)
+    ).all()
+    return [tuple(r) for r in rows]
+
+
+def order(user_id, amount):
+    return {"user_id": user_id, "product_name": "Teclado", "amount": amount}
+
+
+def test_every_write_path_keeps_the_stats(client, user):
+    other = client.post("/users", json={"name": "Beto", "email": "beto@example.com"}).get_json()
+
+    client.post("/orders", json=order(user["id"], 10.5))
+    client.post("/orders/batch", json={"orders": [order(user["id"], 4), order(other["id"], 7)]})
+    client.post(
+        "/import/orders",
+        data=f'{{"user_id": {other["id"]}, "product_name": "Mouse", "amount": 2.25}}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    db.session.add(Order(user_id=user["id"], product_name="Monitor", amount=Decimal("100")))
+    db.session.commit()
+
+    assert stored_stats() == expected_stats()
+    assert stored_stats()[0][1:3] == (3, Decimal("114.50"))
+
+
+def test_stats_follow_orm_updates_and_deletes(client, user):
+    other = client.post("/users", json={"name": "Beto", "email": "beto@example.com"}).get_json()
+    client.post("/orders/batch", json={"orders": [order(user["id"], 4), order(user["id"], 6)]})
+
+    first, second = db.session.scalars(select(Order).order_by(Order.id)).all()
+    first.user_id = other["id"]
+    db.session.delete(second)
+    db.session.commit()
+
+    assert stored_stats() == expected_stats()
+
+
+def test_bulk_seed_keeps_the_stats(app):
+    seed_faker.run_bulk(users=5, orders=40, batch_size=15)
+
+    assert stored_stats() == expected_stats()
+    assert sum(count for _, count, _, _ in stored_stats()) == 40
+
+
+def test_summary(client, user):
+    for amount in (10, 5.5):
+        created = client.post("/orders", json=order(user["id"], amount)).get_json()
+
+    resp = client.get(f"/users/{user['id']}/summary")
+
+    assert resp.status_code == 200
+    assert resp.get_json() == {
+        "user_id": user["id"],
+        "order_count": 2,
+        "total_spent": 15.5,
+        "avg_ticket": 7.75,
+        "last_order_at": created["created_at"],
+    }
+
+
+def test_summary_without_orders(client, user):
+    assert client.get(f"/users/{user['id']}/summary").get_json() == {
+        "user_id": user["id"],
+        "order_count": 0,
+        "total_spent": 0.0,
+        "avg_ticket": None,
+        "last_order_at": None,
+    }
+
+
+def test_summary_of_an_unknown_user(client):
+    resp = client.get("/users/999/summary")
+    assert resp.status_code == 404
+    assert resp.get_json()["error"]["code"] == "user_not_found"
+    assert db.session.get(User, 999) is None
@@ -0,0 +1,70 @@
+from flask_migrate import upgrade
+from sqlalchemy import text
+
+from app import create_app
+from app.config import TestConfig
+from app.extensions import db
+from tests.conftest import MIGRATIONS
+
+
+def post_user(client, name):
+    resp = client.post("/users", json={"name": name, "email": f"{name.lower()}@example.com"})
+    return resp.get_json()["id"]
+
+
+def test_batch_returns_the_orders_in_request_order(client):
+    ana, beto = post_user(client, "Ana"), post_user(client, "Beto")
+    items = [
+        {"user_id": beto, "product_name": "Mouse", "amount": 5},
+        {"user_id": ana, "product_name": "Teclado", "amount": 10.5},
+        {"user_id": beto, "product_name": "Monitor", "amount": 120},
+    ]
+
+    resp = client.post("/orders/batch", json={"orders": items})
+
+    assert resp.status_code == 201
+    created = resp.get_json()["items"]
+    assert [(o["user_id"], o["product_name"]) for o in created] == [
+        (i["user_id"], i["product_name"]) for i in items
+    ]
+    assert [o["id"] for o in created] == sorted(o["id"] for o in created)
+
+
+def test_order_for_an_unknown_user_is_rejected(client, user):
+    resp = client.post(
+        "/orders", json={"user_id": user["id"] + 1, "product_name": "Teclado", "amount": 10}
+    )
+
+    assert resp.status_code == 422
+    assert resp.get_json()["error"]["message"] == "user_id no existe"
+    assert client.get("/orders").get_json()["items"] == []
+
+
+def test_unknown_user_is_rejected_without_the_sqlite_fk_pragma(monkeypatch):
+    monkeypatch.setattr(TestConfig, "SQLITE_FOREIGN_KEYS", False)
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        assert db.session.execute(text("PRAGMA foreign_keys")).scalar() == 0
+        client = app.test_client()
+
+        resp = client.post("/orders", json={"user_id": 1, "product_name": "Teclado", "amount": 10})
+
+        assert resp.status_code == 422
+        assert client.get("/orders").get_json()["items"] == []
+        db.session.remove()
+
+
+def test_order_is_created_with_id_and_created_at(client, user):
+    resp = client.post(
+        "/orders", json={"user_id": user["id"], "product_name": "Teclado", "amount": 10.5}
+    )
+
+    assert resp.status_code == 201
+    order = resp.get_json()
+    assert (order["user_id"], order["product_name"], order["amount"]) == (
+        user["id"],
+        "Teclado",
+        10.5,
+    )
+    assert order["id"] and order["created_at"]
@@ -0,0 +1,56 @@
+import pytest
+
+from app import plans
+from app.api.users import list_user_orders
+from app.query_guard import max_queries
+
+
+@pytest.fixture
+def orders(client, user):
+    for amount in (10, 20, 30):
+        resp = client.post(
+            "/orders", json={"user_id": user["id"], "product_name": "Mouse", "amount": amount}
+        )
+        assert resp.status_code == 201
+    return user
+
+
+def run_user_orders(app, user_id: int):
+    # la vista sin versions.conditional: página y existencia del usuario
+    plan = list_user_orders.plan.__wrapped__
+    with app.test_request_context(f"/users/{user_id}/orders?limit=2"):
+        with max_queries(1):
+            return plans.run(plan(user_id=user_id))
+
+
+def test_user_orders_is_a_single_query(app, orders):
+    body, status = run_user_orders(app, orders["id"])
+    assert status == 200
+    assert len(body.get_json()["items"]) == 2
+
+
+def test_missing_user_is_detected_in_the_same_query(app, orders):
+    _, status = run_user_orders(app, orders["id"] + 1)
+    assert status == 404
+
+
+def test_user_orders_request_queries(client, orders):
+    # la consulta de la página más la de versiones para el ETag
+    with max_queries(2):
+        resp = client.get(f"/users/{orders['id']}/orders?limit=2")
+    assert resp.status_code == 200
+    assert len(resp.get_json()["items"]) == 2
+
+
+def test_max_queries_fails_over_the_limit(client, orders):
+    with pytest.raises(AssertionError, match="máximo 0"):
+        with max_queries(0):
+            client.get(f"/users/{orders['id']}/orders")
+
+
+def test_response_reports_query_count(client, orders):
+    with max_queries(10) as executed:
+        resp = client.get("/users?include=stats&limit=5")
+
+    assert resp.status_code == 200
+    assert resp.headers["X-Query-Count"] == str(len(executed))
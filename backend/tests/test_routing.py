@@ -0,0 +1,65 @@
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app
+from app.config import TestConfig
+from app.extensions import db
+from app.routing import PIN_HEADER, sync_sqlite_replica
+from tests.conftest import MIGRATIONS
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    # primario y réplica en archivos SQLite; la réplica solo cambia con replica-sync
+    monkeypatch.setattr(TestConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path}/primary.db")
+    monkeypatch.setattr(TestConfig, "DATABASE_READ_URL", f"sqlite:///{tmp_path}/replica.db")
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        sync_sqlite_replica(db)
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def user_names(resp):
+    return [u["name"] for u in resp.get_json()["items"]]
+
+
+def test_reads_go_to_the_replica(replica_app):
+    client = replica_app.test_client(use_cookies=False)
+    client.post("/users", json={"name": "Ana", "email": "ana@example.com"})
+    assert user_names(client.get("/users")) == []  # la réplica todavía no la tiene
+
+
+def test_read_after_write_goes_to_the_primary_with_the_pin_header(replica_app):
+    # como el frontend de otro origen: sin cookies, reenvía el header recibido
+    client = replica_app.test_client(use_cookies=False)
+    created = client.post("/users", json={"name": "Ana", "email": "ana@example.com"})
+    pin = created.headers[PIN_HEADER]
+
+    resp = client.get("/users", headers={PIN_HEADER: pin})
+    assert user_names(resp) == ["Ana"]
+
+
+def test_read_after_write_goes_to_the_primary_with_the_cookie(replica_app):
+    client = replica_app.test_client()
+    client.post("/users", json={"name": "Ana", "email": "ana@example.com"})
+    assert user_names(client.get("/users")) == ["Ana"]
+
+
+def test_expired_pin_reads_the_replica(replica_app):
+    client = replica_app.test_client(use_cookies=False)
+    client.post("/users", json={"name": "Ana", "email": "ana@example.com"})
+    assert user_names(client.get("/users", headers={PIN_HEADER: "1"})) == []
+
+
+def test_pin_header_is_exposed_to_cross_origin_clients(replica_app):
+    client = replica_app.test_client(use_cookies=False)
+    resp = client.post(
+        "/users",
+        json={"name": "Ana", "email": "ana@example.com"},
+        headers={"Origin": replica_app.config["CORS_ORIGINS"]},
+    )
+    assert PIN_HEADER in resp.headers["Access-Control-Expose-Headers"]
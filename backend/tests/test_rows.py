@@ -0,0 +1,91 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Order, User
+from app.services import order_stats, rows
+
+NAMES = ['Zoë "Q" Ünïcode', "tab\tnew\\line\n", "日本語 名前", "emoji 😀", "<script>&'"]
+
+
+@pytest.fixture
+def data(app):
+    created = datetime(2024, 2, 29, 23, 59, 58, 123456)
+    for i, name in enumerate(NAMES):
+        user = User(name=name, email=f"u{i}@example.com", created_at=created)
+        db.session.add(user)
+        for amount in ("0.01", "1234.56", "99.90")[: i % 3 + 1]:
+            db.session.add(Order(user=user, product_name=name[::-1], amount=Decimal(amount)))
+    db.session.commit()
+    return db.session.scalars(select(User).order_by(User.id)).all()
+
+
+def dumps(app, obj):
+    # lo que producía jsonify con las entidades ORM (modo compacto)
+    return app.json.dumps(obj, separators=(",", ":"))
+
+
+def user_dict(u):
+    return {"id": u.id, "name": u.name, "email": u.email, "created_at": u.created_at.isoformat()}
+
+
+def order_dict(o, amount=float):
+    return {
+        "id": o.id,
+        "user_id": o.user_id,
+        "product_name": o.product_name,
+        "amount": amount(o.amount),
+        "created_at": o.created_at.isoformat(),
+    }
+
+
+def fetch(stmt):
+    return db.session.execute(stmt.order_by(stmt.selected_columns[0])).all()
+
+
+def test_user_encoders_match_the_orm_dicts(app, data):
+    found = fetch(rows.users_select(with_stats=True))
+    for u, row in zip(data, found, strict=True):
+        assert rows.encode_user(row) == dumps(app, user_dict(u))
+        count = len(u.orders)
+        total = sum(o.amount for o in u.orders)
+        last = max(o.created_at for o in u.orders)
+        expected = {**user_dict(u), **order_stats.summary(count, total, last)}
+        assert rows.encode_user_stats(row) == dumps(app, expected)
+
+
+def test_user_without_orders_has_empty_stats(app):
+    user = User(name="Sin órdenes", email="x@example.com")
+    db.session.add(user)
+    db.session.commit()
+
+    (row,) = fetch(rows.users_select(with_stats=True))
+
+    expected = {**user_dict(user), **order_stats.summary(0, None, None)}
+    assert rows.encode_user_stats(row) == dumps(app, expected)
+
+
+def test_order_encoders_match_the_orm_dicts(app, data):
+    orders = db.session.scalars(select(Order).order_by(Order.id)).all()
+    found = fetch(rows.orders_select(with_user=True))
+    for o, row in zip(orders, found, strict=True):
+        user = {"id": o.user.id, "name": o.user.name, "email": o.user.email}
+        assert rows.encode_order(row) == dumps(app, order_dict(o))
+        assert rows.encode_order_user(row) == dumps(app, {**order_dict(o), "user": user})
+        # GET /users/<id>/orders: amount Decimal, que jsonify serializa como string
+        assert rows.encode_user_order(row) == dumps(app, order_dict(o, amount=lambda a: a))
+
+
+def test_order_without_user_encodes_null(app):
+    row = (1, 2, "x", Decimal("1.50"), datetime(2024, 1, 1), None, None, None)
+    assert json.loads(rows.encode_order_user(row))["user"] is None
+
+
+def test_encoded_rows_are_embedded_as_is(app, data):
+    found = fetch(rows.orders_select())
+    body = dumps(app, {"items": rows.encode_rows(rows.encode_order, found)})
+    assert json.loads(body)["items"] == [json.loads(rows.encode_order(r)) for r in found]
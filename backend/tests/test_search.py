@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models import User
+from app.services import search
+
+
+def search_names(client, q):
+    return [u["name"] for u in client.get(f"/users?q={q}").get_json()["items"]]
+
+
+def test_search_uses_fts_and_notices_when_it_is_dropped(app, client, user):
+    app.config["SEARCH_FTS_CHECK_TTL"] = 0
+    assert search_names(client, "Ana") == ["Ana"]
+
+    # p. ej. un downgrade mientras el worker sigue vivo: pasa a ILIKE
+    db.session.execute(text("DROP TABLE users_fts"))
+    db.session.commit()
+    assert search_names(client, "Ana") == ["Ana"]
+
+
+def test_fts_check_is_a_plan_step(app):
+    # ASGI ejecuta los pasos del plan en la conexión async: la consulta de si
+    # existe el índice no puede salir por el engine sincrónico
+    app.config["SEARCH_FTS_CHECK_TTL"] = 60
+    search._fts_available.clear()
+    step = search.text_filter(User, "Ana")
+    stmt = next(step)
+    assert "sqlite_master" in str(stmt)
+    with pytest.raises(StopIteration) as done:
+        step.send([(1,)])
+    assert "users_fts" in str(done.value.value)
+
+    # vigente: sin consultar otra vez
+    with pytest.raises(StopIteration):
+        next(search.text_filter(User, "Ana"))
@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.fixture
+def two_buyers(client, user):
+    other = client.post("/users", json={"name": "Beto", "email": "beto@example.com"}).get_json()
+    # intercaladas y en el mismo segundo: empates de created_at que desempata el id
+    items = [
+        {"user_id": uid, "product_name": f"P{i}", "amount": 1 + i}
+        for i in range(9)
+        for uid in (user["id"], other["id"])
+    ]
+    created = client.post("/orders/batch", json={"orders": items}).get_json()["items"]
+    mine = [o["id"] for o in created if o["user_id"] == user["id"]]
+    return user["id"], sorted(mine, reverse=True)
+
+
+def test_cursor_walk_over_a_users_orders(client, two_buyers):
+    user_id, expected = two_buyers
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = client.get(f"/users/{user_id}/orders?limit=4&cursor={cursor}").get_json()
+        assert len(body["items"]) <= 4
+        assert {o["user_id"] for o in body["items"]} <= {user_id}
+        ids += [o["id"] for o in body["items"]]
+        cursor = body["next_cursor"]
+
+    assert ids == expected
+
+
+def test_page_mode_counts_from_the_stats(client, two_buyers):
+    user_id, expected = two_buyers
+
+    body = client.get(f"/users/{user_id}/orders?page=3&limit=4").get_json()
+
+    assert [o["id"] for o in body["items"]] == expected[8:]
+    assert (body["total"], body["pages"], body["has_more"]) == (9, 3, False)
+
+
+def test_user_without_orders_has_an_empty_page(client, user):
+    body = client.get(f"/users/{user['id']}/orders").get_json()
+    assert body["items"] == []
+    assert body["total"] == 0
+
+
+def test_unknown_user_is_404(client):
+    resp = client.get("/users/999/orders?cursor=")
+    assert resp.status_code == 404
+    assert resp.get_json()["error"]["code"] == "user_not_found"
@@ -12,8 +12,9 @@ export default function OrdersTable() {
   const [q, setQ] = useState("");
   const [data, setData] = useState<{
     items: Order[];
-    total: number;
-    pages: number;
+    total?: number;
+    pages?: number;
+    hasMore: boolean;
   } | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -26,7 +27,12 @@ export default function OrdersTable() {
       try {
         const res = await listOrders({ page, limit, q });
         if (!cancel)
-          setData({ items: res.items, total: res.total, pages: res.pages });
+          setData({
+            items: res.items,
+            total: res.total,
+            pages: res.pages,
+            hasMore: res.has_more,
+          });
       } catch (e) {
         console.warn("Failed to load orders:", e);
         if (!cancel) setError("No se pudo cargar la lista de órdenes.");
@@ -112,7 +118,10 @@ export default function OrdersTable() {
 
       <div className="card-footer d-flex justify-content-between align-items-center">
         <span className="small text-body-secondary">
-          Página {page} de {data?.pages ?? 1} — Total: {data?.total ?? 0}
+          {/* sin total (p. ej. ?count=none) solo se muestra la página */}
+          Página {page}
+          {data?.pages !== undefined && ` de ${data.pages}`}
+          {data?.total !== undefined && ` — Total: ${data.total}`}
         </span>
         <div className="btn-group">
           <button
@@ -124,7 +133,7 @@ export default function OrdersTable() {
           </button>
           <button
             className="btn btn-outline-secondary btn-sm"
-            disabled={!data || page >= data.pages}
+            disabled={!data?.hasMore}
             onClick={() => setPage((p) => p + 1)}
           >
             Siguiente »
@@ -11,8 +11,9 @@ export default function UsersTable() {
   const [q, setQ] = useState("");
   const [data, setData] = useState<{
     items: User[];
-    total: number;
-    pages: number;
+    total?: number;
+    pages?: number;
+    hasMore: boolean;
   } | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -25,7 +26,12 @@ export default function UsersTable() {
       try {
         const res = await listUsers({ page, limit, q });
         if (!cancel)
-          setData({ items: res.items, total: res.total, pages: res.pages });
+          setData({
+            items: res.items,
+            total: res.total,
+            pages: res.pages,
+            hasMore: res.has_more,
+          });
       } catch (e) {
         console.warn("Failed to load users:", e);
         if (!cancel) setError("No se pudo cargar la lista de usuarios.");
@@ -97,7 +103,10 @@ export default function UsersTable() {
 
       <div className="card-footer d-flex justify-content-between align-items-center">
         <span className="small text-body-secondary">
-          Página {page} de {data?.pages ?? 1} — Total: {data?.total ?? 0}
+          {/* sin total (p. ej. ?count=none) solo se muestra la página */}
+          Página {page}
+          {data?.pages !== undefined && ` de ${data.pages}`}
+          {data?.total !== undefined && ` — Total: ${data.total}`}
         </span>
         <div className="btn-group">
           <button
@@ -109,7 +118,7 @@ export default function UsersTable() {
           </button>
           <button
             className="btn btn-outline-secondary btn-sm"
-            disabled={!data || page >= data.pages}
+            disabled={!data?.hasMore}
             onClick={() => setPage((p) => p + 1)}
           >
             Siguiente »
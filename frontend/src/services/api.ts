@@ -13,14 +13,26 @@ export class ApiError extends Error {
   }
 }
 
+// Read-your-writes con réplica: tras una escritura el backend indica hasta
+// cuándo (epoch en segundos) leer del primario; se reenvía en cada request
+// hasta que vence (la cookie equivalente no viaja entre orígenes)
+const PIN_HEADER = "X-Read-Primary-Until";
+let readPrimaryUntil = 0;
+
 async function typedFetch<T>(
   input: RequestInfo,
   init?: RequestInit
 ): Promise<T> {
-  const res = await fetch(input, {
-    headers: { "Content-Type": "application/json" },
-    ...init,
-  });
+  const headers = new Headers(init?.headers);
+  if (!headers.has("Content-Type")) {
+    headers.set("Content-Type", "application/json");
+  }
+  if (Date.now() < readPrimaryUntil * 1000) {
+    headers.set(PIN_HEADER, String(readPrimaryUntil));
+  }
+  const res = await fetch(input, { ...init, headers });
+  const pin = Number(res.headers.get(PIN_HEADER));
+  if (pin > readPrimaryUntil) readPrimaryUntil = pin;
   if (!res.ok) {
     let payload: ApiErrorPayload | undefined;
     try {
@@ -62,9 +74,16 @@ export function listUsers(
   return typedFetch<Paginated<User>>(`${API}/users?${query}`);
 }
 
-export function listOrdersByUser(userId: number) {
-  return typedFetch<{ items: Order[]; total: number }>(
-    `${API}/users/${userId}/orders`
+export function listOrdersByUser(
+  userId: number,
+  params: { page?: number; limit?: number } = {}
+) {
+  const query = qs({
+    page: params.page ?? 1,
+    limit: params.limit ?? 10,
+  });
+  return typedFetch<Paginated<Order>>(
+    `${API}/users/${userId}/orders?${query}`
   );
 }
 
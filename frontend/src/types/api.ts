@@ -31,6 +31,8 @@ export type Paginated<T> = {
   items: T[];
   page: number;
   limit: number;
-  total: number;
-  pages: number;
+  has_more: boolean;
+  // ausentes con ?count=none
+  total?: number;
+  pages?: number;
 };